@@ -1,12 +1,12 @@
 """Analytics functions for Amazing Marvin MCP."""
 
+import functools
 import logging
-from datetime import datetime
 from typing import Any, cast
 
 from .api import MarvinAPIClient
-from .cache import done_items_cache
 from .date_utils import DateUtils
+from .task_processor import split_by_type
 
 logger = logging.getLogger(__name__)
 
@@ -55,9 +55,9 @@ def get_productivity_summary_for_time_range(
     """
     try:
         # Determine date range using helper function
-        date_list, start, end = DateUtils.generate_date_range(
-            days, start_date, end_date
-        )
+        dates, start, end = DateUtils.generate_dates(days, start_date, end_date)
+        date_list = [DateUtils.format_date(d) for d in dates]
+        today = DateUtils.get_today()
 
         range_summary = {
             "period_start": DateUtils.format_date(start),
@@ -75,9 +75,19 @@ def get_productivity_summary_for_time_range(
             "api_calls": 0,
         }
 
-        # Get data for each date efficiently
-        for date_str in date_list:
-            _process_date_data(date_str, api_client, range_summary)
+        # Fetch every date concurrently, then fold results in date order
+        items_by_date = api_client.run_concurrently(
+            *(
+                functools.partial(_fetch_done_items, date_str, api_client)
+                for date_str in date_list
+            )
+        )
+        for date_obj, date_str, items in zip(
+            dates, date_list, items_by_date, strict=True
+        ):
+            _process_date_data(
+                date_str, items, range_summary, date_obj.strftime("%A"), today
+            )
 
         # Calculate statistics
         _calculate_statistics(range_summary)
@@ -115,9 +125,9 @@ def get_productivity_summary_for_time_range(
             range_summary["top_projects_with_names"] = []
 
         # Add efficiency metrics using cache stats
-        cache_stats = done_items_cache.get_stats()
+        cache_stats = api_client.cache_stats("/doneItems")
         range_summary["efficiency_metrics"] = {
-            "cached_dates": cache_stats["cached_dates"],
+            "cached_dates": cache_stats["cached_entries"],
             "total_cached_items": cache_stats["total_cached_items"],
             "total_api_calls": range_summary["api_calls"],
         }
@@ -144,14 +154,16 @@ def get_completed_tasks(api_client: MarvinAPIClient) -> dict[str, Any]:
 
         # Use efficient date-filtered API calls
         today = DateUtils.get_today()
-        today_completed = api_client.get_done_items(date=today)
-        yesterday_completed = api_client.get_done_items(date=yesterday)
+        today_completed, yesterday_completed = api_client.run_concurrently(
+            lambda: api_client.get_done_items(date=today),
+            lambda: api_client.get_done_items(date=yesterday),
+        )
 
         # For older items, we could either:
         # 1. Make additional API calls for specific dates
         # 2. Get all items and filter (less efficient but comprehensive)
-        # For now, let's be comprehensive but note the efficiency trade-off
-        all_done_items = api_client.get_done_items(date=today)
+        # For now, reuse today's items rather than fetching them a second time
+        all_done_items = today_completed
 
         # Calculate older items by exclusion
         today_ids = {item.get("_id") for item in today_completed}
@@ -194,61 +206,69 @@ def get_completed_tasks(api_client: MarvinAPIClient) -> dict[str, Any]:
         }
 
 
-def _process_date_data(
-    date_str: str, api_client: MarvinAPIClient, range_summary: dict[str, Any]
-) -> None:
-    """Process data for a single date and update the range_summary dict."""
-    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-    weekday = date_obj.strftime("%A")
-    is_today = date_str == DateUtils.get_today()
-
+def _fetch_done_items(date_str: str, api_client: MarvinAPIClient) -> list[dict] | None:
+    """Fetch one date's completed items, or None if the fetch failed."""
     try:
-        # Use cached API call
-        items = done_items_cache.get(date_str, api_client)
-        count = len(items)
+        return api_client.get_done_items(date=date_str)
+    except Exception as e:
+        logger.warning("Error getting done items for %s: %s", date_str, e)
+        return None
+
 
-        # Track API calls
-        range_summary["api_calls"] += 1
+def _process_date_data(
+    date_str: str,
+    items: list[dict] | None,
+    range_summary: dict[str, Any],
+    weekday: str,
+    today: str,
+) -> None:
+    """Fold a single date's completed items into the range_summary dict."""
+    is_today = date_str == today
 
+    if items is None:
         range_summary["daily_breakdown"][date_str] = {
-            "count": count,
+            "count": 0,
             "weekday": weekday,
             "is_today": is_today,
-            "tasks": items,  # Include actual tasks
+            "tasks": [],
         }
-        range_summary["total_completed"] += count
+        range_summary["tasks_by_date"][date_str] = []
+        return
 
-        # Store tasks by date
-        range_summary["tasks_by_date"][date_str] = items
+    count = len(items)
 
-        # Add to all completed tasks
-        range_summary["all_completed_tasks"].extend(items)
+    # Track API calls
+    range_summary["api_calls"] += 1
 
-        # Track by project with detailed task info
-        for item in items:
-            project_id = item.get("parentId", "unassigned")
+    range_summary["daily_breakdown"][date_str] = {
+        "count": count,
+        "weekday": weekday,
+        "is_today": is_today,
+        "tasks": items,  # Include actual tasks
+    }
+    range_summary["total_completed"] += count
 
-            # Count by project
-            if project_id not in range_summary["by_project"]:
-                range_summary["by_project"][project_id] = 0
-            range_summary["by_project"][project_id] += 1
+    # Store tasks by date
+    range_summary["tasks_by_date"][date_str] = items
 
-            # Store tasks by project
-            if project_id not in range_summary["tasks_by_project"]:
-                range_summary["tasks_by_project"][project_id] = []
-            range_summary["tasks_by_project"][project_id].append(
-                {"task": item, "completed_date": date_str, "weekday": weekday}
-            )
+    # Add to all completed tasks
+    range_summary["all_completed_tasks"].extend(items)
 
-    except Exception as e:
-        logger.warning("Error getting done items for %s: %s", date_str, e)
-        range_summary["daily_breakdown"][date_str] = {
-            "count": 0,
-            "weekday": weekday,
-            "is_today": is_today,
-            "tasks": [],
-        }
-        range_summary["tasks_by_date"][date_str] = []
+    # Track by project with detailed task info
+    for item in items:
+        project_id = item.get("parentId", "unassigned")
+
+        # Count by project
+        if project_id not in range_summary["by_project"]:
+            range_summary["by_project"][project_id] = 0
+        range_summary["by_project"][project_id] += 1
+
+        # Store tasks by project
+        if project_id not in range_summary["tasks_by_project"]:
+            range_summary["tasks_by_project"][project_id] = []
+        range_summary["tasks_by_project"][project_id].append(
+            {"task": item, "completed_date": date_str, "weekday": weekday}
+        )
 
 
 def get_daily_productivity_overview(api_client: MarvinAPIClient) -> dict[str, Any]:
@@ -261,14 +281,18 @@ def get_daily_productivity_overview(api_client: MarvinAPIClient) -> dict[str, An
     """
     today = DateUtils.get_today()
 
-    # Make efficient API calls (5 total instead of 11)
-    # Pass explicit local date so the Marvin API (which defaults to UTC)
-    # returns items for the correct calendar day.
-    today_items = api_client.get_tasks(date=today)  # Today's scheduled items
-    due_items = api_client.get_due_items()  # Overdue/due items
-    today_completed = api_client.get_done_items(date=today)  # Today's completed items
-    projects = api_client.get_projects()  # For project context
-    goals = api_client.get_goals()  # For goal progress
+    # Make efficient API calls (5 total instead of 11), issued concurrently
+    # since none depends on another. Pass explicit local date so the Marvin
+    # API (which defaults to UTC) returns items for the correct calendar day.
+    today_items, due_items, today_completed, projects, goals = (
+        api_client.run_concurrently(
+            lambda: api_client.get_tasks(date=today),  # Today's scheduled items
+            api_client.get_due_items,  # Overdue/due items
+            lambda: api_client.get_done_items(date=today),  # Today's completed items
+            api_client.get_projects,  # For project context
+            api_client.get_goals,  # For goal progress
+        )
+    )
 
     # Combine pending items (removing duplicates)
     all_pending_items = []
@@ -284,12 +308,7 @@ def get_daily_productivity_overview(api_client: MarvinAPIClient) -> dict[str, An
     high_priority = [
         item for item in all_pending_items if item.get("priority") == "high"
     ]
-    pending_projects = [
-        item for item in all_pending_items if item.get("type") == "project"
-    ]
-    pending_tasks = [
-        item for item in all_pending_items if item.get("type") != "project"
-    ]
+    pending_tasks, pending_projects = split_by_type(all_pending_items)
 
     # Calculate metrics
     total_due = len(due_items)
@@ -1,12 +1,133 @@
+import itertools
 import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
+from urllib.parse import quote
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import BaseHTTPResponse
+from urllib3.util.retry import Retry
 
 from .config import get_settings
+from .date_utils import DateUtils
 
 logger = logging.getLogger(__name__)
 
+# Connection pooling / timeout defaults
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 32
+DB_POOL_MAXSIZE = 16
+EXECUTOR_WORKERS = 8
+REQUEST_TIMEOUT = (3.05, 30)  # (connect, read) seconds
+CONNECTION_TEST_TIMEOUT = (3.05, 10)
+MAX_RETRIES = 5
+RETRY_BACKOFF_MAX = 30
+RATE_LIMITED = 429
+
+# TTL (seconds) for read-heavy, low-churn endpoints
+CATEGORIES_TTL = 30
+LABELS_TTL = 60
+GOALS_TTL = 30
+ACCOUNT_TTL = 300
+KUDOS_TTL = 60
+CACHE_MAX_ENTRIES = 1024
+DONE_ITEMS_TODAY_TTL = 30
+DONE_ITEMS_PAST_TTL = 3600  # Past days rarely change; writes still invalidate
+
+# Mango indexes documented in the README: (design doc, index name)
+DB_TYPE_INDEX = ("marvin-mcp", "db-type")
+DB_PARENT_INDEX = ("marvin-mcp", "db-parentId")
+
+
+class _Retry(Retry):
+    """Retry that also retries rate-limited (429) POSTs.
+
+    Marvin rejects a 429 before doing any work, so resending even a
+    non-idempotent request is safe; 5xx retries stay limited to the
+    idempotent methods. A server Retry-After is honoured up to
+    RETRY_BACKOFF_MAX seconds, so no single wait can stall a worker longer.
+    """
+
+    def get_retry_after(self, response: BaseHTTPResponse) -> float | None:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, RETRY_BACKOFF_MAX)
+
+    def is_retry(
+        self, method: str, status_code: int, has_retry_after: bool = False
+    ) -> bool:
+        if status_code == RATE_LIMITED and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def _new_session(
+    headers: dict[str, str] | None = None, pool_maxsize: int = POOL_MAXSIZE
+) -> requests.Session:
+    """Create a keep-alive session with a pooled, retrying adapter."""
+    session = requests.Session()
+    # Bodies are pre-encoded with orjson, so the content type is set once here
+    session.headers["Content-Type"] = "application/json"
+    if headers:
+        session.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize,
+        # Backs off exponentially, or for as long as Retry-After asks
+        max_retries=_Retry(
+            total=MAX_RETRIES,
+            backoff_factor=0.3,
+            backoff_max=RETRY_BACKOFF_MAX,
+            backoff_jitter=0.3,
+            status_forcelist=[RATE_LIMITED, 502, 503, 504],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _exact_id(selector: dict) -> str | None:
+    """Return the ID if selector is exactly {"_id": id} or {"_id": {"$eq": id}}."""
+    if len(selector) != 1 or "_id" not in selector:
+        return None
+    value = selector["_id"]
+    if isinstance(value, dict) and len(value) == 1:
+        value = value.get("$eq")
+    return value if isinstance(value, str) else None
+
+
+# Defaults for fields the Marvin UI expects on every doc of a db; /addTask
+# and /addProject fill these in server-side, direct writes must do it here
+DOC_DEFAULTS: dict[str, dict[str, Any]] = {
+    "Tasks": {"parentId": "unassigned", "day": "unassigned", "done": False, "rank": 0},
+    "Categories": {"parentId": "root", "done": False, "rank": 0},
+}
+
+
+def new_doc(db: str, fields: dict[str, Any]) -> dict[str, Any]:
+    """Build a new Marvin CouchDB document with a fresh _id and timestamps.
+
+    Fields missing from ``fields`` are taken from DOC_DEFAULTS for ``db``;
+    ``_id`` and ``db`` are always generated and can't be overridden.
+    """
+    now = int(time.time() * 1000)
+    return {
+        "createdAt": now,
+        "updatedAt": now,
+        **DOC_DEFAULTS.get(db, {}),
+        **fields,
+        "_id": uuid.uuid4().hex,
+        "db": db,
+    }
+
 
 def create_api_client() -> "MarvinAPIClient":
     """Create API client with settings."""
@@ -18,6 +139,7 @@ def create_api_client() -> "MarvinAPIClient":
         db_name=settings.amazing_marvin_db_name,
         db_user=settings.amazing_marvin_db_user,
         db_password=settings.amazing_marvin_db_password,
+        db_direct_writes=settings.amazing_marvin_db_direct_writes,
     )
 
 
@@ -32,6 +154,7 @@ class MarvinAPIClient:
         db_name: str = "",
         db_user: str = "",
         db_password: str = "",
+        db_direct_writes: bool = False,
     ):
         """
         Initialize the API client with the API key
@@ -43,6 +166,8 @@ class MarvinAPIClient:
             db_name: CouchDB database name
             db_user: CouchDB basic-auth username
             db_password: CouchDB basic-auth password
+            db_direct_writes: Create docs straight in CouchDB instead of via
+                /addTask and /addProject (requires the CouchDB settings)
         """
         self.api_key = api_key
         self.full_access_token = full_access_token
@@ -50,22 +175,70 @@ class MarvinAPIClient:
         self.headers = {"X-API-Token": api_key}
         self.full_access_headers = {"X-Full-Access-Token": full_access_token}
 
+        # Persistent sessions so repeated calls reuse warm TCP/TLS connections
+        self._session = _new_session(self.headers)
+        self._full_session = _new_session(self.full_access_headers)
+        # Bound once to skip the attribute lookups on every request
+        self._api_send = self._session.request
+        self._full_access_send = self._full_session.request
+
+        # endpoint -> (fetched_at, ETag, parsed JSON)
+        self._cache: dict[str, tuple[float, str | None, Any]] = {}
+        self._cache_lock = threading.Lock()
+
+        # Created lazily on first use; the lock keeps racing threads to one pool
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
         # CouchDB / Cloudant direct access
         self._db_uri = db_uri.rstrip("/") if db_uri else ""
         self._db_name = db_name
         self._db_user = db_user
         self._db_password = db_password
+        self._db_direct_writes = db_direct_writes
+        # Separate origin, separate pool; basic auth is set once on the session
+        self._db_session = _new_session(pool_maxsize=DB_POOL_MAXSIZE)
+        if self.has_couchdb:
+            self._db_session.auth = (db_user, db_password)
+        self._db_get = self._db_session.get
+        self._db_post = self._db_session.post
+
+    def close(self) -> None:
+        """Release pooled connections and worker threads held by the client."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+        self._session.close()
+        self._full_session.close()
+        self._db_session.close()
+
+    def __enter__(self) -> "MarvinAPIClient":  # noqa: PYI034
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     @property
     def has_couchdb(self) -> bool:
         """True when CouchDB / Cloudant credentials are fully configured."""
         return all([self._db_uri, self._db_name, self._db_user, self._db_password])
 
+    @property
+    def direct_writes(self) -> bool:
+        """True when new docs are written straight to CouchDB.
+
+        Opt-in, since such docs skip /addTask's server-side processing (e.g.
+        picking dates and labels out of the title).
+        """
+        return self._db_direct_writes and self.has_couchdb
+
     def find_docs(
         self,
         selector: dict,
         fields: list[str] | None = None,
         limit: int = 500,
+        use_index: tuple[str, str] | None = None,
     ) -> list[dict]:
         """Query CouchDB directly via the _find endpoint.
 
@@ -74,6 +247,7 @@ class MarvinAPIClient:
             fields: Optional field projection — only these fields are returned.
                     "_id" is always included.
             limit: Max documents to return (default 500).
+            use_index: Optional (design doc, index name) to run the query on.
 
         Returns:
             List of matching documents.
@@ -82,59 +256,158 @@ class MarvinAPIClient:
             ValueError: If CouchDB credentials are not configured.
             requests.exceptions.HTTPError: On HTTP errors from Cloudant.
         """
+        body = self._find_body(selector, fields, limit, use_index)
+
+        # A bare {"_id": ...} selector is a primary-key lookup; skip Mango
+        doc_id = _exact_id(selector)
+        if doc_id is not None:
+            doc = self._get_doc(doc_id)
+            if doc is None:
+                return []
+            if "fields" in body:
+                doc = {k: doc[k] for k in body["fields"] if k in doc}
+            return [doc]
+
+        return self._post_find(body)["docs"]
+
+    def iter_docs(
+        self,
+        selector: dict,
+        fields: list[str] | None = None,
+        page_size: int = 200,
+        use_index: tuple[str, str] | None = None,
+    ) -> Iterator[dict]:
+        """Lazily yield every document matching selector, one page at a time.
+
+        Pages are chained with CouchDB's bookmark, so memory stays bounded by
+        page_size and all pages reuse the same keep-alive connection.
+        use_index is passed through as in find_docs.
+
+        Raises:
+            ValueError: If CouchDB credentials are not configured.
+            requests.exceptions.HTTPError: On HTTP errors from Cloudant.
+        """
+        body = self._find_body(selector, fields, page_size, use_index)
+        while True:
+            page = self._post_find(body)
+            docs = page["docs"]
+            yield from docs
+            if len(docs) < page_size or not page.get("bookmark"):
+                return
+            body["bookmark"] = page["bookmark"]
+
+    def _find_body(
+        self,
+        selector: dict,
+        fields: list[str] | None,
+        limit: int,
+        use_index: tuple[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Build a _find request body with an optional projection and index."""
+        body: dict[str, Any] = {"selector": selector, "limit": limit}
+        if fields:
+            # Order-preserving dedup keeps the projection stable between calls
+            body["fields"] = list(dict.fromkeys([*fields, "_id"]))
+        if use_index:
+            body["use_index"] = list(use_index)
+        return body
+
+    def _get_doc(self, doc_id: str) -> dict | None:
+        """Fetch one document from CouchDB by ID, or None when it doesn't exist."""
         if not self.has_couchdb:
             raise ValueError(
                 "CouchDB credentials not configured. "
                 "Set AMAZING_MARVIN_DB_URI, _DB_NAME, _DB_USER, _DB_PASSWORD."
             )
 
-        url = f"{self._db_uri}/{self._db_name}/_find"
-        body: dict[str, Any] = {"selector": selector, "limit": limit}
-        if fields:
-            body["fields"] = list(set(fields) | {"_id"})
-
-        logger.debug("CouchDB _find → %s  selector=%s", url, selector)
-        response = requests.post(
+        url = f"{self._db_uri}/{self._db_name}/{quote(doc_id, safe='')}"
+        response = self._db_get(
             url,
-            json=body,
-            auth=(self._db_user, self._db_password),
+            timeout=REQUEST_TIMEOUT,
         )
+        not_found_status = 404
+        if response.status_code == not_found_status:
+            return None
         response.raise_for_status()
-        return response.json()["docs"]
-
-    def _make_request(
-        self, method: str, endpoint: str, data: dict | None = None
-    ) -> Any:
-        """Make a request to the API"""
-        url = f"{self.base_url}{endpoint}"
-        logger.debug("Making %s request to %s", method, url)
+        return orjson.loads(response.content)
 
-        try:
-            if method.lower() == "get":
-                response = requests.get(url, headers=self.headers)
-            elif method.lower() == "post":
-                response = requests.post(url, headers=self.headers, json=data)
-            elif method.lower() == "put":
-                response = requests.put(url, headers=self.headers, json=data)
-            elif method.lower() == "delete":
-                response = requests.delete(url, headers=self.headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+    def _post_find(self, body: dict[str, Any]) -> dict[str, Any]:
+        """POST a body to the CouchDB _find endpoint and decode the response."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("CouchDB _find selector=%s", body["selector"])
+        return self._post_db("_find", body)
 
-            response.raise_for_status()
+    def _post_db(self, path: str, body: dict[str, Any]) -> Any:
+        """POST a JSON body to a CouchDB database endpoint and decode the response."""
+        if not self.has_couchdb:
+            raise ValueError(
+                "CouchDB credentials not configured. "
+                "Set AMAZING_MARVIN_DB_URI, _DB_NAME, _DB_USER, _DB_PASSWORD."
+            )
 
-            # Handle 204 No Content responses
-            no_content_status = 204
-            if response.status_code == no_content_status or not response.content:
-                return {}
+        url = f"{self._db_uri}/{self._db_name}/{path}"
+        response = self._db_post(
+            url,
+            data=orjson.dumps(body),
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
-            return response.json()
+    def _request(
+        self,
+        send: Callable[..., requests.Response],
+        method: str,
+        url: str,
+        data: dict | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> requests.Response:
+        """Send a request via a bound session method, raising on HTTP errors."""
+        try:
+            response = send(
+                method.upper(),
+                url,
+                data=None if data is None else orjson.dumps(data),
+                headers=headers,
+                timeout=REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
         except requests.exceptions.HTTPError:
             logger.exception("HTTP error")
             raise
         except requests.exceptions.RequestException:
             logger.exception("Request error")
             raise
+        else:
+            return response
+
+    @staticmethod
+    def _decode(response: requests.Response) -> Any:
+        """Decode a JSON response body."""
+        # Handle 204 No Content responses
+        no_content_status = 204
+        if response.status_code == no_content_status or not response.content:
+            return {}
+        return orjson.loads(response.content)
+
+    def _send(
+        self,
+        send: Callable[..., requests.Response],
+        method: str,
+        url: str,
+        data: dict | None = None,
+    ) -> Any:
+        """Send a request via a bound session method and decode the JSON body."""
+        return self._decode(self._request(send, method, url, data))
+
+    def _make_request(
+        self, method: str, endpoint: str, data: dict | None = None
+    ) -> Any:
+        """Make a request to the API"""
+        url = f"{self.base_url}{endpoint}"
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Making %s request to %s", method, url)
+        return self._send(self._api_send, method, url, data)
 
     def _make_full_access_request(
         self, method: str, endpoint: str, data: dict | None = None
@@ -145,31 +418,99 @@ class MarvinAPIClient:
                 "Full access token not configured. Set AMAZING_MARVIN_FULL_ACCESS_TOKEN."
             )
         url = f"{self.base_url}{endpoint}"
-        logger.debug("Making full-access %s request to %s", method, url)
-
-        try:
-            if method.lower() == "get":
-                response = requests.get(url, headers=self.full_access_headers)
-            elif method.lower() == "post":
-                response = requests.post(
-                    url, headers=self.full_access_headers, json=data
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Making full-access %s request to %s", method, url)
+        return self._send(self._full_access_send, method, url, data)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """Thread pool for overlapping independent blocking requests."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=EXECUTOR_WORKERS, thread_name_prefix="marvin-api"
                 )
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+            return self._pool
 
-            response.raise_for_status()
+    def run_concurrently(self, *calls: Callable[[], Any]) -> list[Any]:
+        """Run independent blocking calls on the client's thread pool.
 
-            no_content_status = 204
-            if response.status_code == no_content_status or not response.content:
-                return {}
+        Results come back in call order; the first call that raised re-raises
+        here. Calls must not themselves wait on this pool.
+        """
+        pool = self._executor()
+        futures = [pool.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+    def _cached(self, key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """Return the cached value for key, refilling it via fetch after ttl."""
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Cache hit for %s", key)
+            return entry[2]
+
+        result = fetch()
+        self._store(key, None, result)
+        return result
 
-            return response.json()
-        except requests.exceptions.HTTPError:
-            logger.exception("HTTP error (full access)")
-            raise
-        except requests.exceptions.RequestException:
-            logger.exception("Request error (full access)")
-            raise
+    def _cached_get(self, endpoint: str, ttl: float) -> Any:
+        """GET an endpoint, serving it from the in-process cache within ttl.
+
+        Once an entry expires it is revalidated with If-None-Match when the
+        server sent an ETag; a 304 keeps the cached body and restarts the ttl.
+        """
+        entry = self._cache.get(endpoint)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Cache hit for %s", endpoint)
+            return entry[2]
+
+        etag = entry[1] if entry is not None else None
+        response = self._request(
+            self._api_send,
+            "get",
+            f"{self.base_url}{endpoint}",
+            headers={"If-None-Match": etag} if etag else None,
+        )
+        not_modified_status = 304
+        if entry is not None and response.status_code == not_modified_status:
+            logger.debug("Revalidated cached %s", endpoint)
+            result = entry[2]
+        else:
+            etag = response.headers.get("ETag")
+            result = self._decode(response)
+        self._store(endpoint, etag, result)
+        return result
+
+    def is_cached(self, key: str, ttl: float) -> bool:
+        """True when key has a cache entry younger than ttl (no request needed)."""
+        entry = self._cache.get(key)
+        return entry is not None and time.monotonic() - entry[0] < ttl
+
+    def _store(self, key: str, etag: str | None, value: Any) -> None:
+        """Cache value under key, evicting the oldest entry once the cache is full."""
+        with self._cache_lock:
+            # Bound the cache; per-date /doneItems keys would otherwise pile up
+            if key not in self._cache and len(self._cache) >= CACHE_MAX_ENTRIES:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = (time.monotonic(), etag, value)
+
+    def invalidate(self, endpoint: str | None = None) -> None:
+        """Drop a cached endpoint, or the whole cache when endpoint is None."""
+        with self._cache_lock:
+            if endpoint is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(endpoint, None)
+
+    def cache_stats(self, prefix: str = "") -> dict[str, int]:
+        """Count cached entries whose key starts with prefix, and the items in them."""
+        with self._cache_lock:
+            values = [v for k, (_, _, v) in self._cache.items() if k.startswith(prefix)]
+        return {
+            "cached_entries": len(values),
+            "total_cached_items": sum(len(v) for v in values if isinstance(v, list)),
+        }
 
     def get_tasks(self, date: str | None = None) -> list[dict]:
         """Get all tasks and projects (use /todayItems or /dueItems for scheduled/due, or /children for subtasks)"""
@@ -180,7 +521,15 @@ class MarvinAPIClient:
         return self._make_request("get", endpoint)
 
     def read_doc(self, item_id: str) -> dict:
-        """Read any document by ID using the full access token."""
+        """Read any document by ID.
+
+        Uses a direct CouchDB primary-key lookup when configured, otherwise
+        (or when CouchDB doesn't have the doc) the full access token.
+        """
+        if self.has_couchdb:
+            doc = self._get_doc(item_id)
+            if doc is not None:
+                return doc
         return self._make_full_access_request("get", f"/doc?id={item_id}")
 
     def get_projects(self) -> list[dict]:
@@ -188,17 +537,31 @@ class MarvinAPIClient:
         Get all projects (as categories with type 'project').
 
         Note: "Work" and "Personal" are default projects created for most users.
+
+        With CouchDB configured the type filter runs server-side via _find,
+        so plain categories never travel over the wire.
         """
+        if self.has_couchdb:
+            return self._cached(
+                "_find:projects",
+                CATEGORIES_TTL,
+                lambda: list(
+                    self.iter_docs(
+                        {"db": "Categories", "type": "project"},
+                        use_index=DB_TYPE_INDEX,
+                    )
+                ),
+            )
         categories = self.get_categories()
         return [cat for cat in categories if cat.get("type") == "project"]
 
     def get_categories(self) -> list[dict]:
         """Get all categories"""
-        return self._make_request("get", "/categories")
+        return self._cached_get("/categories", CATEGORIES_TTL)
 
     def get_labels(self) -> list[dict]:
         """Get all labels"""
-        return self._make_request("get", "/labels")
+        return self._cached_get("/labels", LABELS_TTL)
 
     def get_due_items(self) -> list[dict]:
         """Get all due items (experimental endpoint)"""
@@ -217,7 +580,10 @@ class MarvinAPIClient:
         endpoint = "/doneItems"
         if date:
             endpoint += f"?date={date}"
-        return self._make_request("get", endpoint)
+        past = date is not None and date < DateUtils.get_today()
+        return self._cached_get(
+            endpoint, DONE_ITEMS_PAST_TTL if past else DONE_ITEMS_TODAY_TTL
+        )
 
     def get_all_tasks_for_date(self, date: str) -> list[dict]:
         """Get all tasks for a specific date, including completed ones.
@@ -229,15 +595,20 @@ class MarvinAPIClient:
             List of tasks for that date (both completed and pending)
         """
         try:
-            # Try different approaches to get completed tasks
+            # Scheduled and completed items come from separate endpoints;
+            # fetch both concurrently over the pooled session
+            pool = self._executor()
+            futures = [
+                pool.submit(self._make_request, "get", f"/todayItems?date={date}"),
+                pool.submit(self.get_done_items, date),
+            ]
             result = []
-
-            # 1. Try todayItems with date parameter
-            today_items = self._make_request("get", f"/todayItems?date={date}")
-            result.extend(today_items)
-
-            # 2. Try any additional endpoints that might have completed tasks
-            # The API might have other ways to access completed items
+            seen_ids = set()
+            for item in itertools.chain.from_iterable(f.result() for f in futures):
+                item_id = item.get("_id")
+                if item_id is None or item_id not in seen_ids:
+                    result.append(item)
+                    seen_ids.add(item_id)
         except Exception as e:
             logger.warning("Could not get tasks for date %s: %s", date, e)
             return []
@@ -257,23 +628,96 @@ class MarvinAPIClient:
                 return []
             raise
 
+    def _get_children_or_empty(self, parent_id: str) -> list[dict]:
+        """get_children, but a failure is logged and yields no children."""
+        try:
+            return self.get_children(parent_id)
+        except Exception as e:
+            logger.warning("Failed to get children for parent_id %s: %s", parent_id, e)
+            return []
+
+    def get_children_bulk(self, parent_ids: list[str]) -> dict[str, list[dict]]:
+        """Get the children of several parents, grouped by parent ID.
+
+        With CouchDB configured this is a single _find using $in on parentId
+        instead of one /children request per parent; otherwise the /children
+        requests run concurrently on the client's thread pool, and a parent
+        whose request fails is logged and given no children.
+        """
+        children: dict[str, list[dict]] = {parent_id: [] for parent_id in parent_ids}
+        if not children:
+            return children
+
+        if not self.has_couchdb:
+            results = self._executor().map(self._get_children_or_empty, list(children))
+            return dict(zip(children, results, strict=True))
+
+        docs = self.iter_docs(
+            {
+                "db": {"$in": ["Tasks", "Categories"]},
+                "parentId": {"$in": list(children)},
+            },
+            use_index=DB_PARENT_INDEX,
+        )
+        for doc in docs:
+            children[doc["parentId"]].append(doc)
+        return children
+
     def create_task(self, task_data: dict) -> dict:
         """Create a new task (uses /addTask endpoint)"""
-        return self._make_request("post", "/addTask", data=task_data)
+        result = self._make_request("post", "/addTask", data=task_data)
+        self.invalidate()
+        return result
+
+    def create_task_with_parent(self, task_data: dict) -> dict:
+        """Create a task whose parentId is persisted.
+
+        /addTask doesn't reliably set parentId, so the task is created via
+        /addTask and its parentId patched with update_doc. With direct writes
+        enabled the full task doc is written in one _bulk_docs request instead.
+        """
+        parent_id = task_data["parentId"]
+        if not self.direct_writes:
+            created_task = self.create_task(task_data)
+            task_id = created_task.get("_id")
+            if task_id and created_task.get("parentId") != parent_id:
+                self.update_doc(task_id, [{"key": "parentId", "val": parent_id}])
+                created_task["parentId"] = parent_id
+            return created_task
+
+        doc = new_doc("Tasks", task_data)
+        result = self.bulk_docs([doc])[0]
+        if "error" in result:
+            msg = f"CouchDB rejected task {doc['_id']}: {result.get('reason')}"
+            raise ValueError(msg)
+        doc["_rev"] = result["rev"]
+        return doc
+
+    def bulk_docs(self, docs: list[dict]) -> list[dict]:
+        """Write documents to CouchDB in a single _bulk_docs request.
+
+        Returns CouchDB's per-document results in input order: {"ok", "id",
+        "rev"} on success or {"id", "error", "reason"} on failure.
+        """
+        result = self._post_db("_bulk_docs", {"docs": docs})
+        self.invalidate()
+        return result
 
     def mark_task_done(self, item_id: str, timezone_offset: int = 0) -> dict:
         """Mark a task as done (experimental endpoint)"""
-        return self._make_request(
+        result = self._make_request(
             "post",
             "/markDone",
             data={"itemId": item_id, "timeZoneOffset": timezone_offset},
         )
+        self.invalidate()
+        return result
 
     def test_api_connection(self) -> str:
         """Test API connection and credentials"""
         url = f"{self.base_url}/test"
         try:
-            response = requests.post(url, headers=self.headers)
+            response = self._session.post(url, timeout=CONNECTION_TEST_TIMEOUT)
             response.raise_for_status()
             return response.text.strip()  # Returns "OK" as plain text
         except requests.exceptions.RequestException:
@@ -282,39 +726,58 @@ class MarvinAPIClient:
 
     def start_time_tracking(self, task_id: str) -> dict:
         """Start time tracking for a task (experimental endpoint)"""
-        return self._make_request(
+        result = self._make_request(
             "post", "/track", data={"taskId": task_id, "action": "START"}
         )
+        self.invalidate()
+        return result
 
     def stop_time_tracking(self, task_id: str) -> dict:
         """Stop time tracking for a task (experimental endpoint)"""
-        return self._make_request(
+        result = self._make_request(
             "post", "/track", data={"taskId": task_id, "action": "STOP"}
         )
+        self.invalidate()
+        return result
 
     def get_time_tracks(self, task_ids: list[str]) -> dict:
         """Get time tracking data for specific tasks (experimental endpoint)"""
         return self._make_request("post", "/tracks", data={"taskIds": task_ids})
 
+    def get_time_tracks_bulk(self, task_ids: list[str]) -> list[dict]:
+        """Get time tracking data for tasks straight from CouchDB.
+
+        Reads every task doc in one _all_docs request and returns entries in
+        the /tracks shape ({"task", "times"}), skipping unknown IDs.
+        """
+        result = self._post_db("_all_docs?include_docs=true", {"keys": task_ids})
+        return [
+            {"task": row["id"], "times": row["doc"].get("times", [])}
+            for row in result.get("rows", [])
+            if row.get("doc")
+        ]
+
     def claim_reward_points(self, points: int, item_id: str, date: str) -> dict:
         """Claim reward points for completing a task"""
-        return self._make_request(
+        result = self._make_request(
             "post",
             "/claimRewardPoints",
             data={"points": points, "itemId": item_id, "date": date},
         )
+        self.invalidate()
+        return result
 
     def get_kudos_info(self) -> dict:
         """Get kudos information"""
-        return self._make_request("get", "/kudos")
+        return self._cached_get("/kudos", KUDOS_TTL)
 
     def get_goals(self) -> list[dict]:
         """Get all goals"""
-        return self._make_request("get", "/goals")
+        return self._cached_get("/goals", GOALS_TTL)
 
     def get_account_info(self) -> dict:
         """Get account information"""
-        return self._make_request("get", "/me")
+        return self._cached_get("/me", ACCOUNT_TTL)
 
     def get_currently_tracked_item(self) -> dict:
         """Get currently tracked item"""
@@ -325,20 +788,28 @@ class MarvinAPIClient:
 
     def create_project(self, project_data: dict) -> dict:
         """Create a new project (experimental endpoint)"""
-        return self._make_request("post", "/addProject", data=project_data)
+        result = self._make_request("post", "/addProject", data=project_data)
+        self.invalidate()
+        return result
 
     def create_doc(self, doc_data: dict) -> dict:
         """Create any document using the full access token."""
-        return self._make_full_access_request("post", "/doc/create", data=doc_data)
+        result = self._make_full_access_request("post", "/doc/create", data=doc_data)
+        self.invalidate()
+        return result
 
     def update_doc(self, item_id: str, setters: list[dict]) -> dict:
         """Update any document by ID using the full access token."""
-        return self._make_full_access_request(
+        result = self._make_full_access_request(
             "post", "/doc/update", data={"itemId": item_id, "setters": setters}
         )
+        self.invalidate()
+        return result
 
     def delete_doc(self, item_id: str) -> dict:
         """Delete any document by ID using the full access token."""
-        return self._make_full_access_request(
+        result = self._make_full_access_request(
             "post", "/doc/delete", data={"itemId": item_id}
         )
+        self.invalidate()
+        return result
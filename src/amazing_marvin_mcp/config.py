@@ -1,14 +1,37 @@
+import atexit
+import functools
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """Configure root logging for the CLI entry point.
+
+    Not called on import, so applications embedding this package keep
+    control over their own handlers. Records are handed to a background
+    listener thread, so a tool logging a failure never blocks the event loop
+    on the stderr write.
+    """
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(listener.stop)
+    queue_handler = QueueHandler(log_queue)
+    # Left bare so the listener's formatter applies LOG_FORMAT exactly once
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=level, handlers=[queue_handler])
+
 
 class Settings(BaseSettings):
     """Configuration settings for the Amazing Marvin MCP"""
@@ -24,6 +47,10 @@ class Settings(BaseSettings):
     amazing_marvin_db_name: str = Field(default="", env="AMAZING_MARVIN_DB_NAME")
     amazing_marvin_db_user: str = Field(default="", env="AMAZING_MARVIN_DB_USER")
     amazing_marvin_db_password: str = Field(default="", env="AMAZING_MARVIN_DB_PASSWORD")
+    # Write new tasks/projects straight to CouchDB (skips /addTask processing)
+    amazing_marvin_db_direct_writes: bool = Field(
+        default=False, env="AMAZING_MARVIN_DB_DIRECT_WRITES"
+    )
 
     # Server settings
     port: int = Field(default=3000, env="PORT")
@@ -39,8 +66,13 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
+@functools.lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get configuration settings with environment variable validation"""
+    """Get configuration settings with environment variable validation.
+
+    Settings are parsed once per process; call get_settings.cache_clear()
+    to pick up environment changes (e.g. in tests).
+    """
     try:
         return Settings()
     except Exception:
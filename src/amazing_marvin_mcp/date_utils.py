@@ -30,42 +30,46 @@ class DateUtils:
         return DateUtils.format_date(yesterday)
 
     @staticmethod
-    def generate_date_range(
+    def generate_dates(
         days: int | None = None,
         start_date: str | None = None,
         end_date: str | None = None,
-    ) -> tuple[list[str], datetime, datetime]:
-        """Generate a list of dates and start/end datetime objects based on inputs.
+    ) -> tuple[list[datetime], datetime, datetime]:
+        """Generate the dates in a range and its start/end datetime objects.
 
         Args:
-            days: Number of days to look back from today
+            days: Number of days to look back from today (default: 7)
             start_date: Start date in YYYY-MM-DD format (overrides days parameter)
             end_date: End date in YYYY-MM-DD format (defaults to today if start_date provided)
 
         Returns:
-            Tuple of (date_list, start_datetime, end_datetime)
+            Tuple of (dates, start_datetime, end_datetime). With start_date the
+            dates run oldest first, otherwise newest first from today.
+
+        Raises:
+            ValueError: If a date is malformed or end_date is before start_date.
         """
         if start_date:
             # Use explicit date range
             start = DateUtils.parse_date(start_date)
             end = DateUtils.parse_date(end_date) if end_date else datetime.now()
+            if end < start:
+                msg = f"end_date {end_date} is before start_date {start_date}"
+                raise ValueError(msg)
 
             # Generate list of dates in range
-            date_list = []
+            dates = []
             current = start
             while current <= end:
-                date_list.append(DateUtils.format_date(current))
+                dates.append(current)
                 current += timedelta(days=1)
         else:
             # Use days parameter (default behavior)
             if days is None:
                 days = 7
             today = datetime.now()
-            date_list = []
-            for i in range(days):
-                date = today - timedelta(days=i)
-                date_list.append(DateUtils.format_date(date))
+            dates = [today - timedelta(days=i) for i in range(days)]
             start = today - timedelta(days=days - 1)
             end = today
 
-        return date_list, start, end
+        return dates, start, end
@@ -1,11 +1,18 @@
-import json
+import asyncio
+import functools
+import importlib.util
+import inspect
 import logging
 import os
 import re
+import sys
 import time
-from datetime import datetime
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
 from typing import Annotated, Any
 
+import anyio
+import orjson
 from pydantic import BeforeValidator
 
 
@@ -22,14 +29,12 @@ def _coerce_json_list(v: Any) -> list | None:
         return v
     if isinstance(v, str):
         try:
-            parsed = json.loads(v)
+            parsed = orjson.loads(v)
             if isinstance(parsed, list):
                 return parsed
-        except (json.JSONDecodeError, TypeError):
+        except orjson.JSONDecodeError:
             pass
-        raise ValueError(
-            f"Expected list or JSON-encoded list, got string: {v!r}"
-        )
+        raise ValueError(f"Expected list or JSON-encoded list, got string: {v!r}")
     return v
 
 
@@ -41,14 +46,12 @@ def _coerce_json_dict(v: Any) -> dict | None:
         return v
     if isinstance(v, str):
         try:
-            parsed = json.loads(v)
+            parsed = orjson.loads(v)
             if isinstance(parsed, dict):
                 return parsed
-        except (json.JSONDecodeError, TypeError):
+        except orjson.JSONDecodeError:
             pass
-        raise ValueError(
-            f"Expected dict or JSON-encoded dict, got string: {v!r}"
-        )
+        raise ValueError(f"Expected dict or JSON-encoded dict, got string: {v!r}")
     return v
 
 
@@ -68,7 +71,8 @@ from .analytics import (
 from .analytics import (
     get_productivity_summary_for_time_range as get_productivity_summary_for_time_range_impl,
 )
-from .api import create_api_client
+from .api import LABELS_TTL, MarvinAPIClient, create_api_client
+from .config import setup_logging
 from .date_utils import DateUtils
 from .projects import (
     create_project_with_tasks as create_project_impl,
@@ -77,12 +81,14 @@ from .projects import (
     get_project_overview as get_project_overview_impl,
 )
 from .response_models import StandardResponse
+from .task_processor import split_by_type
 from .tasks import (
     batch_create_tasks as batch_create_tasks_impl,
 )
 from .tasks import (
     get_all_tasks_impl,
     get_child_tasks_recursive,
+    resolve_label,
 )
 from .tool_converter import (
     create_error_response,
@@ -93,112 +99,274 @@ from .tool_converter import (
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Monotonic nanosecond clock for debug timing; tools pass 0 when debug is off
+_now = time.perf_counter_ns
+
 # Initialize MCP
 mcp: FastMCP = FastMCP(name="amazing-marvin-mcp")
 
+# Max in-flight API requests per batch tool call
+_CONCURRENCY = int(os.getenv("MARVIN_CONCURRENCY", "16"))
 
-@mcp.tool()
-async def get_tasks(debug: bool = False) -> StandardResponse:
-    """Get today's scheduled tasks only.
+# Shared across tool calls so its connection pools and caches are reused
+_API_CLIENT: MarvinAPIClient | None = None
 
-    Use when you need only today's scheduled items without overdue or completed items.
-    For comprehensive daily overview, use get_daily_productivity_overview() instead.
-    For all tasks across projects, use get_all_tasks().
+
+def _get_api_client() -> MarvinAPIClient:
+    """Return the process-wide API client, creating it on first use."""
+    global _API_CLIENT  # noqa: PLW0603
+    if _API_CLIENT is None:
+        _API_CLIENT = create_api_client()
+    return _API_CLIENT
+
+
+@functools.lru_cache(maxsize=128)
+def _contains_pattern(contains: str) -> str:
+    """Build the case-insensitive Mango $regex for a contains search.
+
+    A leading "^" anchors the match to the start of the field, which lets
+    CouchDB's regex engine reject non-matching docs after a few characters
+    instead of scanning the whole title/note.
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        today = DateUtils.get_today()
-        raw_tasks = api_client.get_tasks(date=today)
-
-        return create_task_response(
-            api_client=api_client,
-            raw_tasks=raw_tasks,
-            summary_text=f"Retrieved {len(raw_tasks)} scheduled tasks for today",
-            api_endpoint="/todayItems",
-            api_calls_made=4,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get tasks")
-        return create_error_response(e, "/todayItems", debug, start_time)
+    if contains.startswith("^"):
+        return f"(?i)^{re.escape(contains[1:])}"
+    return f"(?i){re.escape(contains)}"
 
 
-@mcp.tool()
-async def get_projects(debug: bool = False) -> StandardResponse:
-    """Get all projects (categories with type 'project').
+def _set_range(selector: dict[str, Any], field: str, op: str, value: str) -> None:
+    """Merge one bound into a Mango range filter on ``field``."""
+    selector.setdefault(field, {})[op] = value
+
+
+def _set_contains(selector: dict[str, Any], contains: str) -> None:
+    """Add the case-insensitive title/note text search to ``selector``."""
+    pattern = _contains_pattern(contains)
+    selector["$or"] = [{"title": {"$regex": pattern}}, {"note": {"$regex": pattern}}]
+
+
+# _find row cap for query_tasks; ID-only rows are tiny, so they get a higher one
+_FIND_LIMIT = 500
+_ID_ONLY_FIND_LIMIT = 5000
+
 
-    Use when you need project list for organization or project selection.
-    For detailed project analysis, use get_project_overview(project_id).
+# Constant query_tasks selector fragments, shared by every call; the selector
+# is only serialized, never mutated in place, so these must not be either.
+_NOT_DONE = {"$ne": True}
+_NOT_PROJECT_OR_CATEGORY = ({"type": "project"}, {"type": "category"})
+
+
+# query_tasks argument name → selector mutation. Ranges come before the exact
+# due/scheduled builders so an exact date replaces any range on that field.
+_SELECTOR_BUILDERS: dict[str, Callable[[dict[str, Any], Any], None]] = {
+    "contains": _set_contains,
+    "due_after": lambda s, v: _set_range(s, "dueDate", "$gte", v),
+    "due_before": lambda s, v: _set_range(s, "dueDate", "$lte", v),
+    "due": lambda s, v: s.update(dueDate=v),
+    "scheduled_after": lambda s, v: _set_range(s, "day", "$gte", v),
+    "scheduled_before": lambda s, v: _set_range(s, "day", "$lte", v),
+    "scheduled": lambda s, v: s.update(day=v),
+    "parent_id": lambda s, v: s.update(parentId=v),
+    "is_starred": lambda s, v: s.update(isStarred=1 if v else 0),
+}
+
+# query_tasks argument name → fragment of the summary's filter description
+_FILTER_DESCRIPTIONS: dict[str, Callable[[Any], str]] = {
+    "contains": lambda v: f"contains='{v}'",
+    "due_after": lambda v: f"due>={v}",
+    "due_before": lambda v: f"due<={v}",
+    "due": lambda v: f"due={v}",
+    "scheduled_after": lambda v: f"scheduled>={v}",
+    "scheduled_before": lambda v: f"scheduled<={v}",
+    "scheduled": lambda v: f"scheduled={v}",
+    "parent_id": lambda v: f"parent={v}",
+    "is_starred": lambda v: f"starred={'yes' if v else 'no'}",
+}
+
+
+ToolBody = Callable[..., Awaitable[StandardResponse]]
+
+
+def _empty_batch_response(
+    result_key: str, endpoint: str, debug: bool, start_time: int
+) -> StandardResponse:
+    """Response for a batch tool called with nothing to do."""
+    return create_simple_response(
+        data={
+            result_key: [],
+            "failed_tasks": [],
+            "success_count": 0,
+            "failure_count": 0,
+            "total_requested": 0,
+        },
+        summary_text="No tasks provided",
+        api_endpoint=endpoint,
+        api_calls_made=0,
+        debug=debug,
+        start_time=start_time,
+    )
+
+
+def _marvin_tool(
+    endpoint: str, action: str, empty_batch: tuple[str, str] | None = None
+) -> Callable[[ToolBody], ToolBody]:
+    """Wrap a tool body with the shared API client, timing and error handling.
+
+    The body receives the client and start time as keyword-only
+    ``api_client`` and ``start_time`` arguments, which are left out of the
+    tool's signature. On failure the error is logged as "Failed to <action>",
+    where ``action`` may name parameters in braces (e.g. "mark task {task_id}
+    as done"), and returned as an error response for ``endpoint``.
+
+    For batch tools, ``empty_batch`` is (list parameter, result list key): an
+    empty list is answered right away, before the API client is built.
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        projects = api_client.get_projects()
 
-        return create_simple_response(
-            data=projects,
-            summary_text=f"Retrieved {len(projects)} projects",
-            api_endpoint="/categories",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get projects")
-        return create_error_response(e, "/categories", debug, start_time)
+    def decorate(body: ToolBody) -> ToolBody:
+        signature = inspect.signature(body)
+        params = [
+            param
+            for name, param in signature.parameters.items()
+            if name not in {"api_client", "start_time"}
+        ]
+        tool_signature = signature.replace(parameters=params)
+
+        @functools.wraps(body)
+        async def tool(*args: Any, **kwargs: Any) -> StandardResponse:
+            arguments = tool_signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            debug = arguments.arguments["debug"]
+            start_time = _now() if debug else 0
+            if empty_batch is not None and not arguments.arguments[empty_batch[0]]:
+                return _empty_batch_response(
+                    empty_batch[1], endpoint, debug, start_time
+                )
+            try:
+                return await body(
+                    *args, api_client=_get_api_client(), start_time=start_time, **kwargs
+                )
+            except Exception as e:
+                logger.exception("Failed to %s", action.format_map(arguments.arguments))
+                return create_error_response(e, endpoint, debug, start_time)
+
+        # FastMCP builds the tool schema from the exposed parameters only
+        del tool.__wrapped__  # type: ignore[attr-defined]
+        tool.__signature__ = tool_signature  # type: ignore[attr-defined]
+        tool.__annotations__ = {param.name: param.annotation for param in params} | {
+            "return": signature.return_annotation
+        }
+        return tool
 
+    return decorate
 
-@mcp.tool()
-async def get_categories(debug: bool = False) -> StandardResponse:
-    """Get categories from Amazing Marvin"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        categories = api_client.get_categories()
+
+def _simple_tool(
+    name: str,
+    endpoint: str,
+    summary: Callable[[Any], str],
+    data_key: str | None = None,
+    doc: str | None = None,
+) -> ToolBody:
+    """Build a tool that returns the result of one no-argument client method.
+
+    ``name`` is both the tool name and the MarvinAPIClient method called, and
+    ``summary`` turns that method's result into the response summary text.
+    """
+
+    @_marvin_tool(endpoint, name.replace("_", " "))
+    async def tool(
+        debug: bool = False, *, api_client: MarvinAPIClient, start_time: int
+    ) -> StandardResponse:
+        result = await asyncio.to_thread(getattr(api_client, name))
 
         return create_simple_response(
-            data=categories,
-            summary_text=f"Retrieved {len(categories)} categories",
-            api_endpoint="/categories",
+            data=result if data_key is None else {data_key: result},
+            summary_text=summary(result),
+            api_endpoint=endpoint,
             api_calls_made=1,
             debug=debug,
             start_time=start_time,
         )
-    except Exception as e:
-        logger.exception("Failed to get categories")
-        return create_error_response(e, "/categories", debug, start_time)
+
+    tool.__name__ = tool.__qualname__ = name
+    tool.__doc__ = doc
+    return tool
 
 
 @mcp.tool()
-async def get_due_items(debug: bool = False) -> StandardResponse:
-    """Get overdue and due tasks only (past due date).
+@_marvin_tool("/todayItems", "get tasks")
+async def get_tasks(
+    debug: bool = False, *, api_client: MarvinAPIClient, start_time: int
+) -> StandardResponse:
+    """Get today's scheduled tasks only.
 
-    Use when you need to focus specifically on urgent/overdue items.
-    For complete daily view including today's tasks, use get_daily_productivity_overview().
+    Use when you need only today's scheduled items without overdue or completed items.
+    For comprehensive daily overview, use get_daily_productivity_overview() instead.
+    For all tasks across projects, use get_all_tasks().
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        due_items = api_client.get_due_items()
+    today = DateUtils.get_today()
+    raw_tasks = await asyncio.to_thread(api_client.get_tasks, date=today)
+
+    # Task processing resolves project/category/label names over HTTP
+    return await asyncio.to_thread(
+        create_task_response,
+        api_client=api_client,
+        raw_tasks=raw_tasks,
+        summary_text=f"Retrieved {len(raw_tasks)} scheduled tasks for today",
+        api_endpoint="/todayItems",
+        api_calls_made=4,
+        debug=debug,
+        start_time=start_time,
+    )
+
+
+get_projects = mcp.tool()(
+    _simple_tool(
+        "get_projects",
+        "/categories",
+        lambda projects: f"Retrieved {len(projects)} projects",
+        doc="""Get all projects (categories with type 'project').
+
+        Use when you need project list for organization or project selection.
+        For detailed project analysis, use get_project_overview(project_id).
+    """,
+    )
+)
+
+
+get_categories = mcp.tool()(
+    _simple_tool(
+        "get_categories",
+        "/categories",
+        lambda categories: f"Retrieved {len(categories)} categories",
+        doc="Get categories from Amazing Marvin",
+    )
+)
 
-        return create_simple_response(
-            data={"due_items": due_items},
-            summary_text=f"Retrieved {len(due_items)} overdue/due items",
-            api_endpoint="/dueItems",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get due items")
-        return create_error_response(e, "/dueItems", debug, start_time)
+
+get_due_items = mcp.tool()(
+    _simple_tool(
+        "get_due_items",
+        "/dueItems",
+        lambda due_items: f"Retrieved {len(due_items)} overdue/due items",
+        data_key="due_items",
+        doc="""Get overdue and due tasks only (past due date).
+
+        Use when you need to focus specifically on urgent/overdue items.
+        For complete daily view including today's tasks, use get_daily_productivity_overview().
+    """,
+    )
+)
 
 
 @mcp.tool()
+@_marvin_tool("/children", "get child tasks for {parent_id}")
 async def get_child_tasks(
-    parent_id: str, recursive: bool = False, debug: bool = False
+    parent_id: str,
+    recursive: bool = False,
+    debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Get child tasks of a specific parent task or project (experimental).
 
@@ -211,48 +379,47 @@ async def get_child_tasks(
 
     Note: This is an experimental endpoint and may not work for all parent types.
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        if recursive:
-            result = get_child_tasks_recursive(api_client, parent_id)
-            api_calls = result.get("api_calls_made", 3)  # Estimate for recursive calls
-        else:
-            children = api_client.get_children(parent_id)
-            # Categorize non-recursive results for consistency
-            tasks = [item for item in children if item.get("type") != "project"]
-            projects = [item for item in children if item.get("type") == "project"]
-
-            result = {
-                "parent_id": parent_id,
-                "total_children": len(children),
-                "tasks": tasks,
-                "projects": projects,
-                "task_count": len(tasks),
-                "project_count": len(projects),
-                "all_children": children,
-                "recursive": False,
-            }
-            api_calls = 1
-
-        return create_simple_response(
-            data=result,
-            summary_text=f"Retrieved {result.get('total_children', 0)} child items for parent {parent_id}",
-            api_endpoint="/children",
-            api_calls_made=api_calls,
-            debug=debug,
-            start_time=start_time,
+    if recursive:
+        result = await asyncio.to_thread(
+            get_child_tasks_recursive, api_client, parent_id
         )
-    except Exception as e:
-        logger.exception("Failed to get child tasks for %s", parent_id)
-        return create_error_response(e, "/children", debug, start_time)
+        api_calls = result.get("api_calls_made", 3)  # Estimate for recursive calls
+    else:
+        children = await asyncio.to_thread(api_client.get_children, parent_id)
+        # Categorize non-recursive results for consistency
+        tasks, projects = split_by_type(children)
+
+        result = {
+            "parent_id": parent_id,
+            "total_children": len(children),
+            "tasks": tasks,
+            "projects": projects,
+            "task_count": len(tasks),
+            "project_count": len(projects),
+            "all_children": children,
+            "recursive": False,
+        }
+        api_calls = 1
+
+    return create_simple_response(
+        data=result,
+        summary_text=f"Retrieved {result.get('total_children', 0)} child items for parent {parent_id}",
+        api_endpoint="/children",
+        api_calls_made=api_calls,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
+@_marvin_tool("/categories + /children", "get all tasks")
 async def get_all_tasks(
     label: str | None = None,
     fields: JsonStrList | None = None,
     debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Get all tasks across all projects with optional label filtering (comprehensive search).
 
@@ -267,38 +434,24 @@ async def get_all_tasks(
 
     Note: This is a heavy operation that recursively searches all projects.
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        result = get_all_tasks_impl(api_client, label)
-
-        # Project fields if requested
-        if fields and "tasks" in result:
-            field_set = set(fields) | {"_id"}
-            result["tasks"] = [
-                {k: v for k, v in task.items() if k in field_set}
-                for task in result["tasks"]
-            ]
-            result["fields_returned"] = sorted(field_set)
+    result = await asyncio.to_thread(get_all_tasks_impl, api_client, label, fields)
 
-        # Estimate API calls based on typical project count
-        estimated_api_calls = result.get("api_calls_made", 5)
+    # Estimate API calls based on typical project count
+    estimated_api_calls = result.get("api_calls_made", 5)
 
-        return create_simple_response(
-            data=result,
-            summary_text=f"Retrieved {result.get('total_tasks', 0)} tasks across all projects"
-            + (f" with label '{label}'" if label else ""),
-            api_endpoint="/categories + /children",
-            api_calls_made=estimated_api_calls,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get all tasks")
-        return create_error_response(e, "/categories + /children", debug, start_time)
+    return create_simple_response(
+        data=result,
+        summary_text=f"Retrieved {result.get('total_tasks', 0)} tasks across all projects"
+        + (f" with label '{label}'" if label else ""),
+        api_endpoint="/categories + /children",
+        api_calls_made=estimated_api_calls,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
+@_marvin_tool("CouchDB _find", "query tasks via CouchDB")
 async def query_tasks(
     label: str | None = None,
     fields: JsonStrList | None = None,
@@ -313,6 +466,9 @@ async def query_tasks(
     parent_id: str | None = None,
     is_starred: bool | None = None,
     debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Fast query of all tasks via CouchDB _find (single HTTP request).
 
@@ -324,9 +480,12 @@ async def query_tasks(
         label: Optional label name to filter by.
         fields: Optional list of field names to return per task (e.g.
             ["title", "day", "dueDate", "parentId"]).  "_id" is always
-            included.  When omitted every field is returned.
+            included.  When omitted every field is returned.  Pass ["_id"]
+            when only IDs or a count are needed: the payload is much smaller
+            and up to 5000 matches are returned instead of 500.
         include_done: If True, include completed tasks (default False).
         contains: Case-insensitive text search across title and note fields.
+            Prefix with "^" to match only at the start (e.g. "^Call").
         due: Exact due date match (YYYY-MM-DD). Takes precedence over
             due_before/due_after.
         due_before: Tasks due on or before this date (YYYY-MM-DD).
@@ -342,228 +501,153 @@ async def query_tasks(
     Requires env vars: AMAZING_MARVIN_DB_URI, _DB_NAME, _DB_USER,
     _DB_PASSWORD.
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-
-        if not api_client.has_couchdb:
-            return create_error_response(
-                ValueError(
-                    "CouchDB credentials not configured. "
-                    "Set AMAZING_MARVIN_DB_URI, _DB_NAME, _DB_USER, _DB_PASSWORD "
-                    "to use query_tasks. Use get_all_tasks as a fallback."
-                ),
-                "CouchDB _find",
-                debug,
-                start_time,
-            )
-
-        # Build Mango selector
-        selector: dict[str, Any] = {"db": "Tasks"}
-        if not include_done:
-            selector["done"] = {"$ne": True}
-
-        # Label filter — resolve name → ID
-        api_calls = 0
-        if label:
-            labels = api_client.get_labels()
-            api_calls += 1
-            label_match = next(
-                (lb for lb in labels if lb.get("title", "").lower() == label.lower()),
-                None,
-            )
-            if label_match:
-                selector["labelIds"] = {"$elemMatch": {"$eq": label_match["_id"]}}
-            else:
-                return create_simple_response(
-                    data={"tasks": [], "total_tasks": 0},
-                    summary_text=f"No label found matching '{label}'",
-                    api_endpoint="CouchDB _find",
-                    api_calls_made=api_calls,
-                    debug=debug,
-                    start_time=start_time,
-                )
-
-        # Text search — case-insensitive regex across title and note
-        if contains:
-            pattern = f"(?i){re.escape(contains)}"
-            selector["$or"] = [
-                {"title": {"$regex": pattern}},
-                {"note": {"$regex": pattern}},
-            ]
-
-        # Due date filters
-        if due:
-            selector["dueDate"] = due
-        elif due_before or due_after:
-            due_filter: dict[str, str] = {}
-            if due_after:
-                due_filter["$gte"] = due_after
-            if due_before:
-                due_filter["$lte"] = due_before
-            selector["dueDate"] = due_filter
-
-        # Scheduled date filters
-        if scheduled:
-            selector["day"] = scheduled
-        elif scheduled_before or scheduled_after:
-            day_filter: dict[str, str] = {}
-            if scheduled_after:
-                day_filter["$gte"] = scheduled_after
-            if scheduled_before:
-                day_filter["$lte"] = scheduled_before
-            selector["day"] = day_filter
-
-        # Exact match filters
-        if parent_id:
-            selector["parentId"] = parent_id
-        if is_starred is not None:
-            selector["isStarred"] = 1 if is_starred else 0
-
-        docs = api_client.find_docs(selector, fields=fields)
-        api_calls += 1  # The _find call itself
-
-        # Filter out projects/categories client-side
-        tasks = [
-            d for d in docs if d.get("type") not in ("project", "category")
-        ]
-
-        result: dict[str, Any] = {
-            "tasks": tasks,
-            "total_tasks": len(tasks),
-            "source": "CouchDB _find query",
-        }
-        if fields:
-            result["fields_returned"] = sorted(set(fields) | {"_id"})
-        if label:
-            result["label_filter"] = label
-
-        filters = []
-        if label:
-            filters.append(f"label='{label}'")
-        if contains:
-            filters.append(f"contains='{contains}'")
-        if due:
-            filters.append(f"due={due}")
-        if due_before:
-            filters.append(f"due<={due_before}")
-        if due_after:
-            filters.append(f"due>={due_after}")
-        if scheduled:
-            filters.append(f"scheduled={scheduled}")
-        if scheduled_before:
-            filters.append(f"scheduled<={scheduled_before}")
-        if scheduled_after:
-            filters.append(f"scheduled>={scheduled_after}")
-        if parent_id:
-            filters.append(f"parent={parent_id}")
-        if is_starred is not None:
-            filters.append(f"starred={'yes' if is_starred else 'no'}")
-        filter_desc = f" ({', '.join(filters)})" if filters else ""
-        summary_text = f"Retrieved {len(tasks)} tasks via CouchDB{filter_desc}"
-
-        return create_simple_response(
-            data=result,
-            summary_text=summary_text,
-            api_endpoint="CouchDB _find",
-            api_calls_made=api_calls,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to query tasks via CouchDB")
-        return create_error_response(e, "CouchDB _find", debug, start_time)
-
-
-@mcp.tool()
-async def get_labels(debug: bool = False) -> StandardResponse:
-    """Get all labels from Amazing Marvin"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        labels = api_client.get_labels()
-
-        return create_simple_response(
-            data={"labels": labels},
-            summary_text=f"Retrieved {len(labels)} labels",
-            api_endpoint="/labels",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
+    if not api_client.has_couchdb:
+        return create_error_response(
+            ValueError(
+                "CouchDB credentials not configured. "
+                "Set AMAZING_MARVIN_DB_URI, _DB_NAME, _DB_USER, _DB_PASSWORD "
+                "to use query_tasks. Use get_all_tasks as a fallback."
+            ),
+            "CouchDB _find",
+            debug,
+            start_time,
         )
-    except Exception as e:
-        logger.exception("Failed to get labels")
-        return create_error_response(e, "/labels", debug, start_time)
-
 
-@mcp.tool()
-async def get_goals(debug: bool = False) -> StandardResponse:
-    """Get all goals from Amazing Marvin"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        goals = api_client.get_goals()
-
-        return create_simple_response(
-            data={"goals": goals},
-            summary_text=f"Retrieved {len(goals)} goals",
-            api_endpoint="/goals",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
+    # Start resolving the label name → ID while the selector is built; a
+    # fresh cached /labels response costs no API call
+    label_cached = bool(label) and api_client.is_cached("/labels", LABELS_TTL)
+    label_task = (
+        asyncio.create_task(asyncio.to_thread(resolve_label, api_client, label))
+        if label
+        else None
+    )
+
+    # Build Mango selector
+    # $nor rather than type $nin: Mango's $nin never matches docs that lack
+    # a type field, and plain tasks usually have none
+    selector: dict[str, Any] = {"db": "Tasks", "$nor": _NOT_PROJECT_OR_CATEGORY}
+    if not include_done:
+        selector["done"] = _NOT_DONE
+
+    active_filters = [
+        (name, value)
+        for name, value in (
+            ("contains", contains),
+            ("due_after", due_after),
+            ("due_before", due_before),
+            ("due", due),
+            ("scheduled_after", scheduled_after),
+            ("scheduled_before", scheduled_before),
+            ("scheduled", scheduled),
+            ("parent_id", parent_id),
+            ("is_starred", is_starred),
         )
-    except Exception as e:
-        logger.exception("Failed to get goals")
-        return create_error_response(e, "/goals", debug, start_time)
+        if value is not None and value != ""
+    ]
+    for name, value in active_filters:
+        _SELECTOR_BUILDERS[name](selector, value)
+
+    # Label filter
+    api_calls = 0
+    if label and label_task is not None:
+        label_id = await label_task
+        api_calls += 0 if label_cached else 1
+        if label_id:
+            selector["labelIds"] = {"$elemMatch": {"$eq": label_id}}
+        else:
+            return create_simple_response(
+                data={"tasks": [], "total_tasks": 0},
+                summary_text=f"No label found matching '{label}'",
+                api_endpoint="CouchDB _find",
+                api_calls_made=api_calls,
+                debug=debug,
+                start_time=start_time,
+            )
 
+    ids_only = set(fields or ()) == {"_id"}
+    tasks = await asyncio.to_thread(
+        api_client.find_docs,
+        selector,
+        fields=fields,
+        limit=_ID_ONLY_FIND_LIMIT if ids_only else _FIND_LIMIT,
+    )
+    api_calls += 1  # The _find call itself
+
+    result: dict[str, Any] = {
+        "tasks": tasks,
+        "total_tasks": len(tasks),
+        "source": "CouchDB _find query",
+    }
+    if fields:
+        result["fields_returned"] = sorted(set(fields) | {"_id"})
+    if label:
+        result["label_filter"] = label
+
+    filters = [f"label='{label}'"] if label else []
+    filters.extend(_FILTER_DESCRIPTIONS[name](value) for name, value in active_filters)
+    filter_desc = f" ({', '.join(filters)})" if filters else ""
+    summary_text = f"Retrieved {len(tasks)} tasks via CouchDB{filter_desc}"
+
+    return create_simple_response(
+        data=result,
+        summary_text=summary_text,
+        api_endpoint="CouchDB _find",
+        api_calls_made=api_calls,
+        debug=debug,
+        start_time=start_time,
+    )
+
+
+get_labels = mcp.tool()(
+    _simple_tool(
+        "get_labels",
+        "/labels",
+        lambda labels: f"Retrieved {len(labels)} labels",
+        data_key="labels",
+        doc="Get all labels from Amazing Marvin",
+    )
+)
 
-@mcp.tool()
-async def get_account_info(debug: bool = False) -> StandardResponse:
-    """Get account information from Amazing Marvin"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        account = api_client.get_account_info()
 
-        return create_simple_response(
-            data={"account": account},
-            summary_text="Retrieved account information",
-            api_endpoint="/me",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get account info")
-        return create_error_response(e, "/me", debug, start_time)
+get_goals = mcp.tool()(
+    _simple_tool(
+        "get_goals",
+        "/goals",
+        lambda goals: f"Retrieved {len(goals)} goals",
+        data_key="goals",
+        doc="Get all goals from Amazing Marvin",
+    )
+)
 
 
-@mcp.tool()
-async def get_currently_tracked_item(debug: bool = False) -> StandardResponse:
-    """Get currently tracked item from Amazing Marvin"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        tracked_item = api_client.get_currently_tracked_item()
+get_account_info = mcp.tool()(
+    _simple_tool(
+        "get_account_info",
+        "/me",
+        lambda _: "Retrieved account information",
+        data_key="account",
+        doc="Get account information from Amazing Marvin",
+    )
+)
 
-        is_tracking = tracked_item and "message" not in tracked_item
 
-        return create_simple_response(
-            data={"tracked_item": tracked_item},
-            summary_text="Currently tracking a task"
-            if is_tracking
-            else "No task currently being tracked",
-            api_endpoint="/me/currentlyTrackedItem",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get currently tracked item")
-        return create_error_response(e, "/me/currentlyTrackedItem", debug, start_time)
+get_currently_tracked_item = mcp.tool()(
+    _simple_tool(
+        "get_currently_tracked_item",
+        "/me/currentlyTrackedItem",
+        lambda tracked_item: (
+            "Currently tracking a task"
+            if tracked_item and "message" not in tracked_item
+            else "No task currently being tracked"
+        ),
+        data_key="tracked_item",
+        doc="Get currently tracked item from Amazing Marvin",
+    )
+)
 
 
 @mcp.tool()
+@_marvin_tool("/addTask", "create task '{title}'")
 async def create_task(
     title: str,
     project_id: str | None = None,
@@ -571,6 +655,9 @@ async def create_task(
     due_date: str | None = None,
     note: str | None = None,
     debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Create a new task in Amazing Marvin.
 
@@ -584,47 +671,45 @@ async def create_task(
     For creating multiple tasks, use batch_create_tasks() instead.
     For creating a project with tasks, use create_project_with_tasks().
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-
-        task_data = {"title": title}
-        if project_id:
-            task_data["parentId"] = project_id
-        if category_id:
-            task_data["categoryId"] = category_id
-        if due_date:
-            task_data["dueDate"] = due_date
-        if note:
-            task_data["note"] = note
-
-        created_task = api_client.create_task(task_data)
-
-        # /addTask doesn't reliably set parentId, so fix it via update_doc
-        parent_id = project_id or category_id
-        task_id = created_task.get("_id")
-        if parent_id and task_id and created_task.get("parentId") != parent_id:
-            api_client.update_doc(task_id, [{"key": "parentId", "val": parent_id}])
-            created_task["parentId"] = parent_id
-
-        api_calls = 2 if parent_id and task_id else 1
-
-        return create_simple_response(
-            data={"created_task": created_task},
-            summary_text=f"Created task: {title}",
-            api_endpoint="/addTask",
-            api_calls_made=api_calls,
-            debug=debug,
-            start_time=start_time,
+    task_data = {"title": title}
+    parent_id = project_id or category_id
+    if parent_id:
+        task_data["parentId"] = parent_id
+    if category_id:
+        task_data["categoryId"] = category_id
+    if due_date:
+        task_data["dueDate"] = due_date
+    if note:
+        task_data["note"] = note
+
+    if parent_id:
+        created_task = await asyncio.to_thread(
+            api_client.create_task_with_parent, task_data
         )
-    except Exception as e:
-        logger.exception("Failed to create task '%s'", title)
-        return create_error_response(e, "/addTask", debug, start_time)
+        api_calls = 1 if api_client.direct_writes else 2
+    else:
+        created_task = await asyncio.to_thread(api_client.create_task, task_data)
+        api_calls = 1
+
+    return create_simple_response(
+        data={"created_task": created_task},
+        summary_text=f"Created task: {title}",
+        api_endpoint="/addTask",
+        api_calls_made=api_calls,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
+@_marvin_tool("/markDone", "mark task {task_id} as done")
 async def mark_task_done(
-    task_id: str, timezone_offset: int = 0, debug: bool = False
+    task_id: str,
+    timezone_offset: int = 0,
+    debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Mark a task as completed in Amazing Marvin.
 
@@ -634,219 +719,202 @@ async def mark_task_done(
 
     For completing multiple tasks, use batch_mark_done(task_ids) instead.
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        completed_task = api_client.mark_task_done(task_id, timezone_offset)
-
-        return create_simple_response(
-            data={"completed_task": completed_task},
-            summary_text=f"Marked task {task_id} as completed",
-            api_endpoint="/markDone",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to mark task %s as done", task_id)
-        return create_error_response(e, "/markDone", debug, start_time)
-
-
-@mcp.tool()
-async def test_api_connection(debug: bool = False) -> StandardResponse:  # noqa: PT028
-    """Test the API connection and credentials.
-
-    Use when troubleshooting connection issues or verifying API setup.
-    Returns "OK" if successful or error details if failed.
-    """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        status = api_client.test_api_connection()
-
-        return create_simple_response(
-            data={"status": status},
-            summary_text=f"API connection test: {status}",
-            api_endpoint="/me",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to test API connection")
-        return create_error_response(e, "/me", debug, start_time)
+    completed_task = await asyncio.to_thread(
+        api_client.mark_task_done, task_id, timezone_offset
+    )
+
+    return create_simple_response(
+        data={"completed_task": completed_task},
+        summary_text=f"Marked task {task_id} as completed",
+        api_endpoint="/markDone",
+        api_calls_made=1,
+        debug=debug,
+        start_time=start_time,
+    )
+
+
+test_api_connection = mcp.tool()(
+    _simple_tool(
+        "test_api_connection",
+        "/me",
+        lambda status: f"API connection test: {status}",
+        data_key="status",
+        doc="""Test the API connection and credentials.
+
+        Use when troubleshooting connection issues or verifying API setup.
+        Returns "OK" if successful or error details if failed.
+    """,
+    )
+)
 
 
 @mcp.tool()
-async def start_time_tracking(task_id: str, debug: bool = False) -> StandardResponse:
+@_marvin_tool("/startTimeTracking", "start time tracking for task {task_id}")
+async def start_time_tracking(
+    task_id: str, debug: bool = False, *, api_client: MarvinAPIClient, start_time: int
+) -> StandardResponse:
     """Start time tracking for a specific task.
 
     Use when beginning focused work on a task to measure time spent.
     Check current tracking status with get_currently_tracked_item() or time_tracking_summary().
     Stop tracking with stop_time_tracking(task_id).
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        tracking = api_client.start_time_tracking(task_id)
+    tracking = await asyncio.to_thread(api_client.start_time_tracking, task_id)
 
-        return create_simple_response(
-            data={"tracking": tracking},
-            summary_text=f"Started time tracking for task {task_id}",
-            api_endpoint="/startTimeTracking",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to start time tracking for task %s", task_id)
-        return create_error_response(e, "/startTimeTracking", debug, start_time)
+    return create_simple_response(
+        data={"tracking": tracking},
+        summary_text=f"Started time tracking for task {task_id}",
+        api_endpoint="/startTimeTracking",
+        api_calls_made=1,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
-async def stop_time_tracking(task_id: str, debug: bool = False) -> StandardResponse:
+@_marvin_tool("/stopTimeTracking", "stop time tracking for task {task_id}")
+async def stop_time_tracking(
+    task_id: str, debug: bool = False, *, api_client: MarvinAPIClient, start_time: int
+) -> StandardResponse:
     """Stop time tracking for a specific task"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        tracking = api_client.stop_time_tracking(task_id)
+    tracking = await asyncio.to_thread(api_client.stop_time_tracking, task_id)
 
-        return create_simple_response(
-            data={"tracking": tracking},
-            summary_text=f"Stopped time tracking for task {task_id}",
-            api_endpoint="/stopTimeTracking",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to stop time tracking for task %s", task_id)
-        return create_error_response(e, "/stopTimeTracking", debug, start_time)
+    return create_simple_response(
+        data={"tracking": tracking},
+        summary_text=f"Stopped time tracking for task {task_id}",
+        api_endpoint="/stopTimeTracking",
+        api_calls_made=1,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
-async def get_time_tracks(task_ids: JsonStrList, debug: bool = False) -> StandardResponse:
+@_marvin_tool("/timeTracks", "get time tracks")
+async def get_time_tracks(
+    task_ids: JsonStrList,
+    debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
+) -> StandardResponse:
     """Get time tracking data for specific tasks"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        time_tracks = api_client.get_time_tracks(task_ids)
-
-        return create_simple_response(
-            data={"time_tracks": time_tracks},
-            summary_text=f"Retrieved time tracking data for {len(task_ids)} tasks",
-            api_endpoint="/timeTracks",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get time tracks")
-        return create_error_response(e, "/timeTracks", debug, start_time)
+    # A single _all_docs read replaces the experimental /tracks endpoint
+    time_tracks = await asyncio.to_thread(
+        api_client.get_time_tracks_bulk
+        if api_client.has_couchdb
+        else api_client.get_time_tracks,
+        task_ids,
+    )
+
+    return create_simple_response(
+        data={"time_tracks": time_tracks},
+        summary_text=f"Retrieved time tracking data for {len(task_ids)} tasks",
+        api_endpoint="/timeTracks",
+        api_calls_made=1,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
+@_marvin_tool("/rewardPoints", "claim reward points")
 async def claim_reward_points(
-    points: int, item_id: str, date: str, debug: bool = False
+    points: int,
+    item_id: str,
+    date: str,
+    debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Claim reward points for completing a task"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        reward = api_client.claim_reward_points(points, item_id, date)
-
-        return create_simple_response(
-            data={"reward": reward},
-            summary_text=f"Claimed {points} reward points for task {item_id}",
-            api_endpoint="/rewardPoints",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to claim reward points")
-        return create_error_response(e, "/rewardPoints", debug, start_time)
-
-
-@mcp.tool()
-async def get_kudos_info(debug: bool = False) -> StandardResponse:
-    """Get kudos and achievement information"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        kudos = api_client.get_kudos_info()
-
-        return create_simple_response(
-            data={"kudos": kudos},
-            summary_text="Retrieved kudos and achievement information",
-            api_endpoint="/me/kudos",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get kudos info")
-        return create_error_response(e, "/me/kudos", debug, start_time)
+    reward = await asyncio.to_thread(
+        api_client.claim_reward_points, points, item_id, date
+    )
+
+    return create_simple_response(
+        data={"reward": reward},
+        summary_text=f"Claimed {points} reward points for task {item_id}",
+        api_endpoint="/rewardPoints",
+        api_calls_made=1,
+        debug=debug,
+        start_time=start_time,
+    )
+
+
+get_kudos_info = mcp.tool()(
+    _simple_tool(
+        "get_kudos_info",
+        "/me/kudos",
+        lambda _: "Retrieved kudos and achievement information",
+        data_key="kudos",
+        doc="Get kudos and achievement information",
+    )
+)
 
 
 @mcp.tool()
+@_marvin_tool("/addCategory", "create project '{title}'")
 async def create_project(
-    title: str, project_type: str = "project", debug: bool = False
+    title: str,
+    project_type: str = "project",
+    debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Create a new project in Amazing Marvin"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-
-        project_data = {"title": title, "type": project_type}
-        created_project = api_client.create_project(project_data)
+    project_data = {"title": title, "type": project_type}
+    created_project = await asyncio.to_thread(api_client.create_project, project_data)
 
-        return create_simple_response(
-            data={"created_project": created_project},
-            summary_text=f"Created project: {title}",
-            api_endpoint="/addCategory",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to create project '%s'", title)
-        return create_error_response(e, "/addCategory", debug, start_time)
+    return create_simple_response(
+        data={"created_project": created_project},
+        summary_text=f"Created project: {title}",
+        api_endpoint="/addCategory",
+        api_calls_made=1,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
+@_marvin_tool("/addCategory + /addTask", "create project with tasks")
 async def create_project_with_tasks(
     project_title: str,
     task_titles: JsonStrList,
     project_type: str = "project",
     debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Create a project with multiple tasks at once"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        result = create_project_impl(
-            api_client, project_title, task_titles, project_type
-        )
+    result = await asyncio.to_thread(
+        create_project_impl, api_client, project_title, task_titles, project_type
+    )
 
-        # Estimate API calls: 1 for project + 1 per task
+    # One _bulk_docs write with direct writes, else 1 for project + 1 per task
+    if api_client.direct_writes:
+        api_calls = 2 if task_titles else 1
+    else:
         api_calls = 1 + len(task_titles)
 
-        return create_simple_response(
-            data=result,
-            summary_text=f"Created project '{project_title}' with {len(task_titles)} tasks",
-            api_endpoint="/addCategory + /addTask",
-            api_calls_made=api_calls,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to create project with tasks")
-        return create_error_response(e, "/addCategory + /addTask", debug, start_time)
+    return create_simple_response(
+        data=result,
+        summary_text=f"Created project '{project_title}' with {len(task_titles)} tasks",
+        api_endpoint="/addCategory + /addTask",
+        api_calls_made=api_calls,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
-async def read_doc(item_id: str, debug: bool = False) -> StandardResponse:
+@_marvin_tool("/doc", "read document {item_id}")
+async def read_doc(
+    item_id: str, debug: bool = False, *, api_client: MarvinAPIClient, start_time: int
+) -> StandardResponse:
     """Read any Amazing Marvin document by its ID.
 
     Returns the full document including all fields. Works for tasks, projects,
@@ -855,29 +923,27 @@ async def read_doc(item_id: str, debug: bool = False) -> StandardResponse:
     Args:
         item_id: The _id of the document to read
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        doc = api_client.read_doc(item_id)
+    doc = await asyncio.to_thread(api_client.read_doc, item_id)
 
-        return create_simple_response(
-            data=doc,
-            summary_text=f"Read document {item_id}",
-            api_endpoint="/doc",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to read document %s", item_id)
-        return create_error_response(e, "/doc", debug, start_time)
+    return create_simple_response(
+        data=doc,
+        summary_text=f"Read document {item_id}",
+        api_endpoint="/doc",
+        api_calls_made=1,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
+@_marvin_tool("/doc/update", "update document {item_id}")
 async def update_doc(
     item_id: str,
     setters: JsonDictList,
     debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Update fields on any Amazing Marvin document.
 
@@ -931,26 +997,27 @@ async def update_doc(
         Schedule for today: [{"key": "day", "val": "2026-02-14"}]
         Multiple fields: [{"key": "title", "val": "New"}, {"key": "dueDate", "val": "2026-03-01"}]
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        result = api_client.update_doc(item_id, setters)
+    result = await asyncio.to_thread(api_client.update_doc, item_id, setters)
 
-        return create_simple_response(
-            data=result,
-            summary_text=f"Updated document {item_id}",
-            api_endpoint="/doc/update",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to update document %s", item_id)
-        return create_error_response(e, "/doc/update", debug, start_time)
+    return create_simple_response(
+        data=result,
+        summary_text=f"Updated document {item_id}",
+        api_endpoint="/doc/update",
+        api_calls_made=1,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
-async def create_doc(doc_data: JsonDict, debug: bool = False) -> StandardResponse:
+@_marvin_tool("/doc/create", "create document")
+async def create_doc(
+    doc_data: JsonDict,
+    debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
+) -> StandardResponse:
     """Create any Amazing Marvin document with full control over all fields.
 
     Unlike create_task, this gives direct access to all document fields
@@ -970,74 +1037,67 @@ async def create_doc(doc_data: JsonDict, debug: bool = False) -> StandardRespons
 
     See update_doc docstring for full field reference.
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        result = api_client.create_doc(doc_data)
+    result = await asyncio.to_thread(api_client.create_doc, doc_data)
 
-        return create_simple_response(
-            data=result,
-            summary_text=f"Created document",
-            api_endpoint="/doc/create",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to create document")
-        return create_error_response(e, "/doc/create", debug, start_time)
+    return create_simple_response(
+        data=result,
+        summary_text=f"Created document",
+        api_endpoint="/doc/create",
+        api_calls_made=1,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
-async def delete_doc(item_id: str, debug: bool = False) -> StandardResponse:
+@_marvin_tool("/doc/delete", "delete document {item_id}")
+async def delete_doc(
+    item_id: str, debug: bool = False, *, api_client: MarvinAPIClient, start_time: int
+) -> StandardResponse:
     """Permanently delete any Amazing Marvin document. This cannot be undone.
 
     Args:
         item_id: The _id of the document to delete
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        result = api_client.delete_doc(item_id)
+    result = await asyncio.to_thread(api_client.delete_doc, item_id)
 
-        return create_simple_response(
-            data=result,
-            summary_text=f"Deleted document {item_id}",
-            api_endpoint="/doc/delete",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to delete document %s", item_id)
-        return create_error_response(e, "/doc/delete", debug, start_time)
+    return create_simple_response(
+        data=result,
+        summary_text=f"Deleted document {item_id}",
+        api_endpoint="/doc/delete",
+        api_calls_made=1,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
+@_marvin_tool("/categories + /children", "get project overview for {project_id}")
 async def get_project_overview(
-    project_id: str, debug: bool = False
+    project_id: str,
+    debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Get comprehensive overview of a project including tasks and progress"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        result = get_project_overview_impl(api_client, project_id)
+    result = await asyncio.to_thread(get_project_overview_impl, api_client, project_id)
 
-        return create_simple_response(
-            data=result,
-            summary_text=f"Retrieved overview for project {project_id}",
-            api_endpoint="/categories + /children",
-            api_calls_made=2,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get project overview for %s", project_id)
-        return create_error_response(e, "/categories + /children", debug, start_time)
+    return create_simple_response(
+        data=result,
+        summary_text=f"Retrieved overview for project {project_id}",
+        api_endpoint="/categories + /children",
+        api_calls_made=2,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
-async def get_daily_productivity_overview(debug: bool = False) -> StandardResponse:
+@_marvin_tool("/todayItems + /dueItems + /doneItems", "get daily productivity overview")
+async def get_daily_productivity_overview(
+    debug: bool = False, *, api_client: MarvinAPIClient, start_time: int
+) -> StandardResponse:
     """Get comprehensive daily productivity overview with today's tasks, overdue items, completed items, and planning insights.
 
     Primary tool for daily planning and productivity. Consolidates multiple data sources efficiently.
@@ -1046,32 +1106,30 @@ async def get_daily_productivity_overview(debug: bool = False) -> StandardRespon
     For specific data only, use: get_tasks() (today's scheduled), get_due_items() (overdue),
     get_all_tasks() (comprehensive search), or get_completed_tasks() (recent completions).
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        result = get_daily_productivity_overview_impl(api_client)
+    result = await asyncio.to_thread(get_daily_productivity_overview_impl, api_client)
 
-        return create_simple_response(
-            data=result,
-            summary_text="Retrieved comprehensive daily productivity overview",
-            api_endpoint="/todayItems + /dueItems + /doneItems",
-            api_calls_made=3,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get daily productivity overview")
-        return create_error_response(
-            e, "/todayItems + /dueItems + /doneItems", debug, start_time
-        )
+    return create_simple_response(
+        data=result,
+        summary_text="Retrieved comprehensive daily productivity overview",
+        api_endpoint="/todayItems + /dueItems + /doneItems",
+        api_calls_made=3,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
+@_marvin_tool(
+    "/addTask", "batch create tasks", empty_batch=("task_list", "created_tasks")
+)
 async def batch_create_tasks(
     task_list: JsonStrList,
     project_id: str | None = None,
     category_id: str | None = None,
     debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Create multiple tasks at once with optional project/category assignment.
 
@@ -1080,145 +1138,144 @@ async def batch_create_tasks(
         project_id: Optional project ID to assign all tasks to
         category_id: Optional category ID for organization
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        result = batch_create_tasks_impl(api_client, task_list, project_id, category_id)
+    result = await asyncio.to_thread(
+        batch_create_tasks_impl, api_client, task_list, project_id, category_id
+    )
 
-        return create_simple_response(
-            data=result,
-            summary_text=f"Created {result.get('success_count', 0)} tasks in batch",
-            api_endpoint="/addTask",
-            api_calls_made=len(task_list),
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to batch create tasks")
-        return create_error_response(e, "/addTask", debug, start_time)
+    return create_simple_response(
+        data=result,
+        summary_text=f"Created {result.get('success_count', 0)} tasks in batch",
+        api_endpoint="/addTask",
+        api_calls_made=1 if api_client.direct_writes else len(task_list),
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
-async def batch_mark_done(task_ids: JsonStrList, debug: bool = False) -> StandardResponse:
+@_marvin_tool(
+    "/markDone", "batch mark tasks done", empty_batch=("task_ids", "completed_tasks")
+)
+async def batch_mark_done(
+    task_ids: JsonStrList,
+    debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
+) -> StandardResponse:
     """Mark multiple tasks as done at once"""
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
+    semaphore = asyncio.Semaphore(_CONCURRENCY)
 
-        completed_tasks = []
-        failed_tasks = []
+    async def mark_one(task_id: str) -> dict:
+        async with semaphore:
+            return await asyncio.to_thread(api_client.mark_task_done, task_id)
 
-        for task_id in task_ids:
-            try:
-                completed_task = api_client.mark_task_done(task_id)
-                completed_tasks.append(completed_task)
-            except Exception as e:
-                failed_tasks.append({"task_id": task_id, "error": str(e)})
+    results = await asyncio.gather(
+        *(mark_one(task_id) for task_id in task_ids), return_exceptions=True
+    )
 
-        result = {
-            "completed_tasks": completed_tasks,
-            "failed_tasks": failed_tasks,
-            "success_count": len(completed_tasks),
-            "failure_count": len(failed_tasks),
-            "total_requested": len(task_ids),
-        }
-
-        return create_simple_response(
-            data=result,
-            summary_text=f"Marked {len(completed_tasks)} of {len(task_ids)} tasks as done",
-            api_endpoint="/markDone",
-            api_calls_made=len(task_ids),
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to batch mark tasks done")
-        return create_error_response(e, "/markDone", debug, start_time)
+    completed_tasks = []
+    failed_tasks = []
+    for task_id, outcome in zip(task_ids, results, strict=True):
+        if isinstance(outcome, BaseException):
+            failed_tasks.append({"task_id": task_id, "error": str(outcome)})
+        else:
+            completed_tasks.append(outcome)
+
+    result = {
+        "completed_tasks": completed_tasks,
+        "failed_tasks": failed_tasks,
+        "success_count": len(completed_tasks),
+        "failure_count": len(failed_tasks),
+        "total_requested": len(task_ids),
+    }
+
+    return create_simple_response(
+        data=result,
+        summary_text=f"Marked {len(completed_tasks)} of {len(task_ids)} tasks as done",
+        api_endpoint="/markDone",
+        api_calls_made=len(task_ids),
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
-async def time_tracking_summary(debug: bool = False) -> StandardResponse:
+@_marvin_tool("/me/currentlyTrackedItem + /me + /me/kudos", "get time tracking summary")
+async def time_tracking_summary(
+    debug: bool = False, *, api_client: MarvinAPIClient, start_time: int
+) -> StandardResponse:
     """Get time tracking overview and productivity insights.
 
     Use when you need to check current time tracking status and get productivity metrics.
     For starting/stopping tracking, use start_time_tracking() or stop_time_tracking().
     For daily productivity overview, use get_daily_productivity_overview().
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-
-        # Get currently tracked item
-        tracked_item = api_client.get_currently_tracked_item()
-
-        # Get account info which may include time tracking stats
-        account = api_client.get_account_info()
-
-        # Get kudos info for productivity rewards
-        kudos = api_client.get_kudos_info()
-
-        is_tracking = tracked_item and "message" not in tracked_item
-
-        result = {
-            "currently_tracking": is_tracking,
-            "tracked_item": tracked_item if is_tracking else None,
-            "account_stats": account,
-            "kudos_info": kudos,
-            "tracking_status": "Active" if is_tracking else "Not tracking",
-            "suggestion": "Start tracking a task to measure productivity"
-            if not is_tracking
-            else f"Currently tracking: {tracked_item.get('title', 'Unknown task')}",
-        }
-
-        return create_simple_response(
-            data=result,
-            summary_text="Active time tracking"
-            if is_tracking
-            else "No active time tracking",
-            api_endpoint="/me/currentlyTrackedItem + /me + /me/kudos",
-            api_calls_made=3,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get time tracking summary")
-        return create_error_response(
-            e, "/me/currentlyTrackedItem + /me + /me/kudos", debug, start_time
-        )
+    # Tracked item, account stats and kudos are independent; fetch together
+    tracked_item, account, kudos = await asyncio.gather(
+        asyncio.to_thread(api_client.get_currently_tracked_item),
+        asyncio.to_thread(api_client.get_account_info),
+        asyncio.to_thread(api_client.get_kudos_info),
+    )
+
+    is_tracking = tracked_item and "message" not in tracked_item
+
+    result = {
+        "currently_tracking": is_tracking,
+        "tracked_item": tracked_item if is_tracking else None,
+        "account_stats": account,
+        "kudos_info": kudos,
+        "tracking_status": "Active" if is_tracking else "Not tracking",
+        "suggestion": "Start tracking a task to measure productivity"
+        if not is_tracking
+        else f"Currently tracking: {tracked_item.get('title', 'Unknown task')}",
+    }
+
+    return create_simple_response(
+        data=result,
+        summary_text="Active time tracking"
+        if is_tracking
+        else "No active time tracking",
+        api_endpoint="/me/currentlyTrackedItem + /me + /me/kudos",
+        api_calls_made=3,
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
-async def get_completed_tasks(debug: bool = False) -> StandardResponse:
+@_marvin_tool("/doneItems", "get completed tasks")
+async def get_completed_tasks(
+    debug: bool = False, *, api_client: MarvinAPIClient, start_time: int
+) -> StandardResponse:
     """Get completed tasks from past 7 days with efficient date filtering and categorization.
 
     Use when you need to review recent accomplishments or productivity patterns.
     For specific date, use get_completed_tasks_for_date(date).
     For custom time ranges, use get_productivity_summary_for_time_range().
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        result = get_completed_tasks_impl(api_client)
+    result = await asyncio.to_thread(get_completed_tasks_impl, api_client)
 
-        return create_simple_response(
-            data=result,
-            summary_text=f"Retrieved {result.get('total_completed', 0)} completed tasks from past 7 days",
-            api_endpoint="/doneItems",
-            api_calls_made=7,  # One call per day for 7 days
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get completed tasks")
-        return create_error_response(e, "/doneItems", debug, start_time)
+    return create_simple_response(
+        data=result,
+        summary_text=f"Retrieved {result.get('total_completed', 0)} completed tasks from past 7 days",
+        api_endpoint="/doneItems",
+        api_calls_made=7,  # One call per day for 7 days
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
+@_marvin_tool("/doneItems", "get productivity summary")
 async def get_productivity_summary_for_time_range(
     days: int | None = None,
     start_date: str | None = None,
     end_date: str | None = None,
     debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Get a comprehensive productivity summary for a specified time range
 
@@ -1233,97 +1290,107 @@ async def get_productivity_summary_for_time_range(
         - get_productivity_summary_for_time_range(start_date='2025-06-01', end_date='2025-06-10')
         - get_productivity_summary_for_time_range(start_date='2025-06-01')  # June 1st to today
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        result = get_productivity_summary_for_time_range_impl(
-            api_client, days, start_date, end_date
+    result = await asyncio.to_thread(
+        get_productivity_summary_for_time_range_impl,
+        api_client,
+        days,
+        start_date,
+        end_date,
+    )
+    if "error" in result:
+        # The impl has already logged the failure; just report it
+        return create_error_response(
+            ValueError(result["error"]), "/doneItems", debug, start_time
         )
 
-        # Estimate API calls based on date range
-        estimated_days = days or 7
-        if start_date and end_date:
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            end = datetime.strptime(end_date, "%Y-%m-%d")
-            estimated_days = (end - start).days + 1
-
-        return create_simple_response(
-            data=result,
-            summary_text=f"Retrieved productivity summary for {estimated_days} days",
-            api_endpoint="/doneItems",
-            api_calls_made=estimated_days,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get productivity summary")
-        return create_error_response(e, "/doneItems", debug, start_time)
+    return create_simple_response(
+        data=result,
+        summary_text=f"Retrieved productivity summary for {result['total_days']} days",
+        api_endpoint="/doneItems",
+        api_calls_made=result["total_days"],
+        debug=debug,
+        start_time=start_time,
+    )
 
 
 @mcp.tool()
+@_marvin_tool("/doneItems", "get completed tasks for {date}")
 async def get_completed_tasks_for_date(
-    date: str, debug: bool = False
+    date: str,
+    include_all: bool = False,
+    debug: bool = False,
+    *,
+    api_client: MarvinAPIClient,
+    start_time: int,
 ) -> StandardResponse:
     """Get completed tasks for a specific date using efficient API filtering
 
     Args:
         date: Date in YYYY-MM-DD format (e.g., '2025-06-13')
+        include_all: Also return the flat all_completed list. Off by default
+            since it repeats every task already in the per-project groups.
     """
-    start_time = time.time()
-    try:
-        api_client = create_api_client()
-        completed_items = api_client.get_done_items(date=date)
-
-        # Group by project for better organization
-        by_project: dict[str, list[dict[str, Any]]] = {}
-        unassigned: list[dict[str, Any]] = []
-
-        for item in completed_items:
-            parent_id = item.get("parentId", "unassigned")
-
-            if parent_id == "unassigned":
-                unassigned.append(item)
-            else:
-                if parent_id not in by_project:
-                    by_project[parent_id] = []
-                by_project[parent_id].append(item)
-
-        result = {
-            "date": date,
-            "total_completed": len(completed_items),
-            "completed_by_project": by_project,
-            "unassigned_completed": unassigned,
-            "project_count": len(by_project),
-            "unassigned_count": len(unassigned),
-            "all_completed": completed_items,
-            "source": f"Efficiently filtered from /doneItems?date={date}",
-        }
-
-        return create_simple_response(
-            data=result,
-            summary_text=f"Retrieved {len(completed_items)} completed tasks for {date}",
-            api_endpoint="/doneItems",
-            api_calls_made=1,
-            debug=debug,
-            start_time=start_time,
-        )
-    except Exception as e:
-        logger.exception("Failed to get completed tasks for %s", date)
-        return create_error_response(e, "/doneItems", debug, start_time)
+    completed_items = await asyncio.to_thread(api_client.get_done_items, date=date)
+
+    # Group by project for better organization; unassigned items are grouped
+    # like any other parent and split off afterwards, keeping the loop branchless
+    by_project: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+    for item in completed_items:
+        by_project[item.get("parentId", "unassigned")].append(item)
+    unassigned = by_project.pop("unassigned", [])
+
+    result = {
+        "date": date,
+        "total_completed": len(completed_items),
+        "completed_by_project": dict(by_project),
+        "unassigned_completed": unassigned,
+        "project_count": len(by_project),
+        "unassigned_count": len(unassigned),
+        "all_completed_count": len(completed_items),
+        "source": f"Efficiently filtered from /doneItems?date={date}",
+    }
+    if include_all:
+        result["all_completed"] = completed_items
+
+    return create_simple_response(
+        data=result,
+        summary_text=f"Retrieved {len(completed_items)} completed tasks for {date}",
+        api_endpoint="/doneItems",
+        api_calls_made=1,
+        debug=debug,
+        start_time=start_time,
+    )
+
+
+def _run_http(host: str, port: int) -> None:
+    """Serve over HTTP, on uvloop when the optional ``speedups`` extra is installed."""
+    use_uvloop = (
+        sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None
+    )
+    anyio.run(
+        functools.partial(mcp.run_async, "http", host=host, port=port),
+        backend_options={"use_uvloop": use_uvloop},
+    )
 
 
 def start():
     """Start the MCP server"""
+    setup_logging()
 
     # Check if we should use HTTP transport (for Smithery deployment)
     transport = os.getenv("MCP_TRANSPORT", "stdio")
 
-    if transport.lower() == "http":
-        host = os.getenv("MCP_HOST", "0.0.0.0")
-        port = int(os.getenv("MCP_PORT", "8000"))
-        mcp.run(transport="http", host=host, port=port)
-    else:
-        mcp.run()  # Default STDIO transport
+    try:
+        if transport.lower() == "http":
+            host = os.getenv("MCP_HOST", "0.0.0.0")
+            port = int(os.getenv("MCP_PORT", "8000"))
+            _run_http(host, port)
+        else:
+            mcp.run()  # Default STDIO transport
+    finally:
+        # Every request shared one client; release its pools on shutdown
+        if _API_CLIENT is not None:
+            _API_CLIENT.close()
 
 
 if __name__ == "__main__":
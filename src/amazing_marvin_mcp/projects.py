@@ -3,7 +3,7 @@
 import logging
 from typing import Any
 
-from .api import MarvinAPIClient
+from .api import MarvinAPIClient, new_doc
 
 logger = logging.getLogger(__name__)
 
@@ -15,18 +15,31 @@ def create_project_with_tasks(
     project_type: str = "project",
 ) -> dict[str, Any]:
     """Create a project with multiple tasks at once."""
-    # Create the project
     project_data = {"title": project_title, "type": project_type}
-    created_project = api_client.create_project(project_data)
-    project_id = created_project.get("_id")
+    created_tasks: list[dict[str, Any]] = []
 
-    # Create tasks in the project
-    created_tasks = []
-    if project_id:
-        for task_title in task_titles:
-            task_data = {"title": task_title, "parentId": project_id}
-            created_task = api_client.create_task(task_data)
-            created_tasks.append(created_task)
+    if api_client.direct_writes:
+        # Assign IDs up front so all tasks go in one write after the project;
+        # new_doc fills the defaults /addProject and /addTask would set
+        project_doc = new_doc("Categories", project_data)
+        task_docs = [
+            new_doc("Tasks", {"title": title, "parentId": project_doc["_id"]})
+            for title in task_titles
+        ]
+        created_project, created_tasks = _bulk_create(
+            api_client, project_doc, task_docs
+        )
+    else:
+        # Create the project
+        created_project = api_client.create_project(project_data)
+        project_id = created_project.get("_id")
+
+        # Create tasks in the project
+        if project_id:
+            for task_title in task_titles:
+                task_data = {"title": task_title, "parentId": project_id}
+                created_task = api_client.create_task(task_data)
+                created_tasks.append(created_task)
 
     return {
         "created_project": created_project,
@@ -35,12 +48,48 @@ def create_project_with_tasks(
     }
 
 
+def _bulk_create(
+    api_client: MarvinAPIClient,
+    project_doc: dict[str, Any],
+    task_docs: list[dict[str, Any]],
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Write a project, then its tasks, to CouchDB with _bulk_docs.
+
+    _bulk_docs isn't atomic, so the project is written on its own first and
+    the tasks only once it exists; that way a rejected project can't leave
+    orphaned tasks behind. Raises ValueError if the project is rejected;
+    rejected tasks are logged and left out of the returned list.
+    """
+    result = api_client.bulk_docs([project_doc])[0]
+    if "error" in result:
+        msg = f"CouchDB rejected project {project_doc['_id']}: {result.get('reason')}"
+        raise ValueError(msg)
+    project_doc["_rev"] = result["rev"]
+    if not task_docs:
+        return project_doc, []
+
+    created_tasks = []
+    results = api_client.bulk_docs(task_docs)
+    for doc, result in zip(task_docs, results, strict=True):
+        if "error" in result:
+            logger.warning(
+                "CouchDB rejected task %s: %s", doc["_id"], result.get("reason")
+            )
+            continue
+        doc["_rev"] = result["rev"]
+        created_tasks.append(doc)
+    return project_doc, created_tasks
+
+
 def get_project_overview(
     api_client: MarvinAPIClient, project_id: str
 ) -> dict[str, Any]:
     """Get comprehensive overview of a project including tasks and progress."""
-    # Get project children
-    children = api_client.get_children(project_id)
+    # Get project children, and project info from categories (projects are
+    # categories), concurrently
+    children, categories = api_client.run_concurrently(
+        lambda: api_client.get_children(project_id), api_client.get_categories
+    )
 
     # Separate completed and pending tasks
     completed_tasks_list = [task for task in children if task.get("done", False)]
@@ -52,8 +101,6 @@ def get_project_overview(
     pending_count = len(pending_tasks_list)
     completion_rate = (completed_count / total_tasks * 100) if total_tasks > 0 else 0
 
-    # Get project info (from categories since projects are categories)
-    categories = api_client.get_categories()
     project_info = next(
         (cat for cat in categories if cat.get("_id") == project_id), None
     )
@@ -38,12 +38,25 @@ REFERENCE_MAPPINGS: dict[str, dict[str, Any]] = {
 }
 
 
+def split_by_type(
+    items: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Split Marvin items into (tasks, projects) in a single pass."""
+    tasks: list[dict[str, Any]] = []
+    projects: list[dict[str, Any]] = []
+    for item in items:
+        (projects if item.get("type") == "project" else tasks).append(item)
+    return tasks, projects
+
+
 def create_lookup_maps(api_client: MarvinAPIClient) -> dict[str, dict[str, str]]:
     """Create lookup maps for resolving references."""
     try:
+        categories, labels = api_client.run_concurrently(
+            api_client.get_categories, api_client.get_labels
+        )
+        # Without CouchDB this filters the /categories response just cached
         projects = api_client.get_projects()
-        categories = api_client.get_categories()
-        labels = api_client.get_labels()
 
         lookup_maps = {
             "projects": {
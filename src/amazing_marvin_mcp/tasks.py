@@ -1,15 +1,40 @@
 """Task management functions for Amazing Marvin MCP."""
 
+import functools
 import itertools
 import logging
 from typing import Any
 
-from .api import MarvinAPIClient
+from .api import MarvinAPIClient, new_doc
 from .date_utils import DateUtils
+from .task_processor import split_by_type
 
 logger = logging.getLogger(__name__)
 
 
+# (labels list, lowercased title -> ID) for the last list get_labels returned
+_LABEL_INDEX: tuple[list[dict], dict[str, str | None]] | None = None
+
+
+def resolve_label(api_client: MarvinAPIClient, label: str) -> str | None:
+    """Resolve a label name (case-insensitive) to its ID, or None if unknown.
+
+    As with a linear search, the first label with a matching title wins. The
+    name map is rebuilt only when get_labels returns a different list, i.e.
+    after the client's /labels cache entry has been refreshed.
+    """
+    global _LABEL_INDEX  # noqa: PLW0603
+    labels = api_client.get_labels()
+    index = _LABEL_INDEX
+    if index is None or index[0] is not labels:
+        ids: dict[str, str | None] = {}
+        for lb in labels:
+            ids.setdefault(lb.get("title", "").lower(), lb.get("_id"))
+        index = (labels, ids)
+        _LABEL_INDEX = index
+    return index[1].get(label.lower())
+
+
 def get_daily_focus(api_client: MarvinAPIClient) -> dict[str, Any]:
     """Get today's focus items - due items, scheduled tasks, and completed tasks."""
     today = DateUtils.get_today()
@@ -33,8 +58,7 @@ def get_daily_focus(api_client: MarvinAPIClient) -> dict[str, Any]:
     high_priority = [
         item for item in all_pending_items if item.get("priority") == "high"
     ]
-    projects = [item for item in all_pending_items if item.get("type") == "project"]
-    tasks = [item for item in all_pending_items if item.get("type") != "project"]
+    tasks, projects = split_by_type(all_pending_items)
 
     return {
         "total_focus_items": len(all_pending_items) + len(today_completed),
@@ -57,36 +81,45 @@ def batch_create_tasks(
     project_id: str | None = None,
     category_id: str | None = None,
 ) -> dict[str, Any]:
-    """Create multiple tasks at once with optional project/category assignment."""
-    created_tasks = []
-    failed_tasks = []
-
+    """Create multiple tasks at once with optional project/category assignment.
+
+    With direct writes enabled every task is written in one _bulk_docs
+    request; otherwise the /addTask calls run concurrently on the client's
+    thread pool.
+    """
+    parent_id = project_id or category_id
+    task_datas = []
     for task_info in task_list:
-        try:
-            # Handle both string titles and dict objects
-            if isinstance(task_info, str):
-                task_data = {"title": task_info}
-            else:
-                task_data = task_info.copy()
-
-            # Add project/category if specified
-            if project_id and "parentId" not in task_data:
-                task_data["parentId"] = project_id
-            if category_id and "categoryId" not in task_data:
-                task_data["categoryId"] = category_id
-
-            created_task = api_client.create_task(task_data)
-
-            # /addTask doesn't reliably set parentId, so fix it via update_doc
-            parent_id = project_id or category_id
-            task_id = created_task.get("_id")
-            if parent_id and task_id and created_task.get("parentId") != parent_id:
-                api_client.update_doc(task_id, [{"key": "parentId", "val": parent_id}])
-                created_task["parentId"] = parent_id
+        # Handle both string titles and dict objects
+        if isinstance(task_info, str):
+            task_data = {"title": task_info}
+        else:
+            task_data = task_info.copy()
+
+        # Add project/category if specified
+        if project_id and "parentId" not in task_data:
+            task_data["parentId"] = project_id
+        if category_id and "categoryId" not in task_data:
+            task_data["categoryId"] = category_id
+        task_datas.append(task_data)
+
+    if api_client.direct_writes:
+        outcomes = _bulk_create_tasks(api_client, task_datas, parent_id)
+    else:
+        outcomes = api_client.run_concurrently(
+            *(
+                functools.partial(_create_one_task, api_client, task_data, parent_id)
+                for task_data in task_datas
+            )
+        )
 
-            created_tasks.append(created_task)
-        except Exception as e:
-            failed_tasks.append({"task": task_info, "error": str(e)})
+    created_tasks = []
+    failed_tasks = []
+    for task_info, outcome in zip(task_list, outcomes, strict=True):
+        if isinstance(outcome, Exception):
+            failed_tasks.append({"task": task_info, "error": str(outcome)})
+        else:
+            created_tasks.append(outcome)
 
     return {
         "created_tasks": created_tasks,
@@ -97,6 +130,52 @@ def batch_create_tasks(
     }
 
 
+def _create_one_task(
+    api_client: MarvinAPIClient, task_data: dict[str, Any], parent_id: str | None
+) -> dict[str, Any] | Exception:
+    """Create a task via /addTask, returning the exception instead of raising."""
+    try:
+        if parent_id:
+            # /addTask doesn't reliably set parentId, so make sure it sticks
+            return api_client.create_task_with_parent(
+                {**task_data, "parentId": parent_id}
+            )
+        return api_client.create_task(task_data)
+    except Exception as e:
+        return e
+
+
+def _bulk_create_tasks(
+    api_client: MarvinAPIClient,
+    task_datas: list[dict[str, Any]],
+    parent_id: str | None,
+) -> list[dict[str, Any] | Exception]:
+    """Write tasks to CouchDB in one _bulk_docs request.
+
+    Returns the created doc or the error for each task, in input order.
+    """
+    if parent_id:
+        task_datas = [{**task_data, "parentId": parent_id} for task_data in task_datas]
+    docs = [new_doc("Tasks", task_data) for task_data in task_datas]
+    try:
+        results = api_client.bulk_docs(docs)
+    except Exception as e:
+        return [e] * len(docs)
+
+    outcomes: list[dict[str, Any] | Exception] = []
+    for doc, result in zip(docs, results, strict=True):
+        if "error" in result:
+            outcomes.append(
+                ValueError(
+                    f"CouchDB rejected task {doc['_id']}: {result.get('reason')}"
+                )
+            )
+        else:
+            doc["_rev"] = result["rev"]
+            outcomes.append(doc)
+    return outcomes
+
+
 def quick_daily_planning(api_client: MarvinAPIClient) -> dict[str, Any]:
     """Get a quick daily planning overview with actionable insights."""
     today = DateUtils.get_today()
@@ -135,36 +214,42 @@ def quick_daily_planning(api_client: MarvinAPIClient) -> dict[str, Any]:
 
 
 def _get_all_children_recursive(
-    api_client: MarvinAPIClient, parent_id: str, visited: set[str] | None = None
+    api_client: MarvinAPIClient, parent_id: str
 ) -> list[dict[str, Any]]:
-    """Recursively get all children of a parent item, avoiding infinite loops."""
-    if visited is None:
-        visited = set()
+    """Get all descendants of a parent item, avoiding infinite loops.
 
-    if parent_id in visited:
-        logger.warning("Circular reference detected for parent_id %s", parent_id)
-        return []
-
-    visited.add(parent_id)
-
-    try:
-        direct_children = api_client.get_children(parent_id)
-        all_children = list(direct_children)  # Copy the list
-
-        # Recursively get children of each child
-        for child in direct_children:
-            child_id = child.get("_id")
-            if child_id:
-                grandchildren = _get_all_children_recursive(
-                    api_client, child_id, visited.copy()
-                )
-                all_children.extend(grandchildren)
+    Walks the tree breadth-first: every parent at one depth is fetched in a
+    single get_children_bulk call, so a tree costs one round-trip per level
+    instead of one per node.
+    """
+    visited = {parent_id}
+    all_children: list[dict[str, Any]] = []
+    level = [parent_id]
 
-    except Exception as e:
-        logger.warning("Failed to get children for parent_id %s: %s", parent_id, e)
-        return []
-    else:
-        return all_children
+    while level:
+        try:
+            children_by_parent = api_client.get_children_bulk(level)
+        except Exception as e:
+            logger.warning("Failed to get children for parent_ids %s: %s", level, e)
+            break
+
+        next_level = []
+        for children in children_by_parent.values():
+            all_children.extend(children)
+            for child in children:
+                child_id = child.get("_id")
+                if not child_id:
+                    continue
+                if child_id in visited:
+                    logger.warning(
+                        "Circular reference detected for parent_id %s", child_id
+                    )
+                    continue
+                visited.add(child_id)
+                next_level.append(child_id)
+        level = next_level
+
+    return all_children
 
 
 def get_child_tasks_recursive(
@@ -174,8 +259,7 @@ def get_child_tasks_recursive(
     all_children = _get_all_children_recursive(api_client, parent_id)
 
     # Categorize children by type
-    tasks = [item for item in all_children if item.get("type") != "project"]
-    projects = [item for item in all_children if item.get("type") == "project"]
+    tasks, projects = split_by_type(all_children)
 
     return {
         "parent_id": parent_id,
@@ -217,9 +301,14 @@ def get_all_nested_items(
 
 
 def get_all_tasks_impl(
-    api_client: MarvinAPIClient, label: str | None = None
+    api_client: MarvinAPIClient,
+    label: str | None = None,
+    fields: list[str] | None = None,
 ) -> dict[str, Any]:
-    """Get all tasks and projects with optional label filtering, using recursive traversal."""
+    """Get all tasks and projects with optional label filtering, using recursive traversal.
+
+    When fields is given, each task is trimmed to those fields (plus "_id").
+    """
     try:
         # Get all top-level items
         today = DateUtils.get_today()
@@ -235,16 +324,7 @@ def get_all_tasks_impl(
 
         # Filter by label if specified
         if label:
-            # Get all labels to understand the label structure
-            labels = api_client.get_labels()
-
-            # Find the label ID
-            label_id = None
-            for lbl in labels:
-                if lbl.get("title", "").lower() == label.lower():
-                    label_id = lbl.get("_id")
-                    break
-
+            label_id = resolve_label(api_client, label)
             if label_id:
                 filtered_items = []
                 for item in all_items:
@@ -263,7 +343,7 @@ def get_all_tasks_impl(
             if item.get("type") not in ["project", "category"]
         ]
 
-        return {
+        result: dict[str, Any] = {
             "tasks": tasks,
             "task_count": len(tasks),
             "filter_applied": label is not None,
@@ -271,6 +351,17 @@ def get_all_tasks_impl(
             "source": "Recursive traversal of all items",
         }
 
+        # The REST API can't project, so trim fields here. Iterating the few
+        # requested keys is cheaper than scanning every key of wide task docs.
+        if fields:
+            field_list = list(dict.fromkeys([*fields, "_id"]))
+            result["tasks"] = [
+                {k: task[k] for k in field_list if k in task} for task in tasks
+            ]
+            result["fields_returned"] = sorted(field_list)
+
     except Exception as e:
         logger.exception("Failed to get all tasks")
         return {"error": str(e), "tasks": [], "task_count": 0}
+    else:
+        return result
@@ -23,11 +23,13 @@ def create_simple_response(
     api_endpoint: str,
     api_calls_made: int = 1,
     debug: bool = False,
-    start_time: float | None = None,
+    start_time: int = 0,
 ) -> StandardResponse:
     """Create a simple StandardResponse for non-task data."""
 
-    response_time = int((time.time() - start_time) * 1000) if start_time else 0
+    response_time = (
+        (time.perf_counter_ns() - start_time) // 1_000_000 if start_time else 0
+    )
 
     # Determine count based on data type
     if isinstance(data, list):
@@ -68,11 +70,13 @@ def create_task_response(
     api_endpoint: str,
     api_calls_made: int = 4,
     debug: bool = False,
-    start_time: float | None = None,
+    start_time: int = 0,
 ) -> StandardResponse:
     """Create a StandardResponse for task data with full processing."""
 
-    response_time = int((time.time() - start_time) * 1000) if start_time else 0
+    response_time = (
+        (time.perf_counter_ns() - start_time) // 1_000_000 if start_time else 0
+    )
 
     # Process tasks with new structure
     clean_tasks, warnings = process_tasks(api_client, raw_tasks)
@@ -106,11 +110,13 @@ def create_error_response(
     error: Exception,
     api_endpoint: str,
     debug: bool = False,
-    start_time: float | None = None,
+    start_time: int = 0,
 ) -> StandardResponse:
     """Create a StandardResponse for errors."""
 
-    response_time = int((time.time() - start_time) * 1000) if start_time else 0
+    response_time = (
+        (time.perf_counter_ns() - start_time) // 1_000_000 if start_time else 0
+    )
 
     return StandardResponse(
         data=[],
@@ -224,6 +224,12 @@ class TestErrorHandling:
         # Should return empty list due to error handling
         assert isinstance(children, list)
 
+    def test_invalid_project_ids_bulk(self, api_client):
+        """Test bulk child lookup keeps every requested parent ID."""
+        children = api_client.get_children_bulk(["invalid_project_id"])
+        assert list(children) == ["invalid_project_id"]
+        assert isinstance(children["invalid_project_id"], list)
+
 
 class TestProjectPlanningEnhancements:
     """Test the new project planning enhancement features."""
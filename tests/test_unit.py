@@ -0,0 +1,718 @@
+"""Offline unit tests for Amazing Marvin MCP helpers (no credentials needed)."""
+
+import asyncio
+import inspect
+import logging
+import threading
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+import requests
+from urllib3 import HTTPResponse
+
+from amazing_marvin_mcp import main
+from amazing_marvin_mcp.api import (
+    DB_PARENT_INDEX,
+    RATE_LIMITED,
+    RETRY_BACKOFF_MAX,
+    MarvinAPIClient,
+    _exact_id,
+    _Retry,
+    new_doc,
+)
+from amazing_marvin_mcp.date_utils import DateUtils
+from amazing_marvin_mcp.projects import create_project_with_tasks
+from amazing_marvin_mcp.response_models import StandardResponse
+from amazing_marvin_mcp.task_processor import split_by_type
+from amazing_marvin_mcp.tasks import batch_create_tasks, resolve_label
+
+NOT_MODIFIED = 304
+
+
+def make_response(status: int, body=None, headers=None) -> requests.Response:
+    """Build a requests.Response without touching the network."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"" if body is None else orjson.dumps(body)
+    response.headers.update(headers or {})
+    return response
+
+
+class StubSend:
+    """Stand-in for a bound session.request that replays canned responses."""
+
+    def __init__(self, *responses: requests.Response):
+        self.responses = list(responses)
+        self.calls: list[dict] = []
+
+    def __call__(self, method, url, **kwargs):
+        self.calls.append({"method": method, "url": url, **kwargs})
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def client():
+    """API client with no real credentials; tests stub its transport."""
+    with MarvinAPIClient(
+        api_key="test-key",
+        db_uri="https://couch.example",
+        db_name="marvin",
+        db_user="user",
+        db_password="password",
+    ) as api_client:
+        yield api_client
+
+
+class TestCachedGet:
+    """ETag revalidation in MarvinAPIClient._cached_get."""
+
+    def test_fresh_entry_is_served_from_cache(self, client):
+        """Within the ttl no request is sent."""
+        client._api_send = StubSend(make_response(200, [{"_id": "a"}]))
+        first = client._cached_get("/labels", ttl=60)
+        second = client._cached_get("/labels", ttl=60)
+        assert first == second == [{"_id": "a"}]
+        assert len(client._api_send.calls) == 1
+
+    def test_304_keeps_cached_body(self, client):
+        """An expired entry is revalidated with If-None-Match."""
+        client._api_send = StubSend(
+            make_response(200, [{"_id": "a"}], {"ETag": '"v1"'}),
+            make_response(NOT_MODIFIED),
+        )
+        client._cached_get("/labels", ttl=0)
+        result = client._cached_get("/labels", ttl=0)
+
+        assert result == [{"_id": "a"}]
+        first, second = client._api_send.calls
+        assert first["headers"] is None
+        assert second["headers"] == {"If-None-Match": '"v1"'}
+
+    def test_changed_body_replaces_entry(self, client):
+        """A 200 on revalidation stores the new body and ETag."""
+        client._api_send = StubSend(
+            make_response(200, [{"_id": "a"}], {"ETag": '"v1"'}),
+            make_response(200, [{"_id": "b"}], {"ETag": '"v2"'}),
+        )
+        client._cached_get("/labels", ttl=0)
+        assert client._cached_get("/labels", ttl=0) == [{"_id": "b"}]
+        assert client._cache["/labels"][1] == '"v2"'
+
+    def test_invalidate_drops_entries(self, client):
+        """Writes clear the cache, so the next read goes to the network."""
+        client._api_send = StubSend(
+            make_response(200, [{"_id": "a"}]), make_response(200, [])
+        )
+        client._cached_get("/labels", ttl=60)
+        client.invalidate()
+        assert client._cached_get("/labels", ttl=60) == []
+
+
+class TestExecutor:
+    """The client's shared thread pool."""
+
+    def test_concurrent_first_use_builds_one_pool(self, client):
+        """Threads racing on first use all get the same executor."""
+        barrier = threading.Barrier(8)
+        pools = []
+
+        def grab():
+            barrier.wait()
+            pools.append(client._executor())
+
+        threads = [threading.Thread(target=grab) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(pool) for pool in pools}) == 1
+
+    def test_run_concurrently_keeps_call_order(self, client):
+        """Results come back in the order the calls were given."""
+        assert client.run_concurrently(lambda: 1, lambda: 2, lambda: 3) == [1, 2, 3]
+
+
+class TestFindHelpers:
+    """Mango selector and _find body helpers."""
+
+    @pytest.mark.parametrize(
+        ("selector", "expected"),
+        [
+            ({"_id": "abc"}, "abc"),
+            ({"_id": {"$eq": "abc"}}, "abc"),
+            ({"_id": {"$in": ["abc"]}}, None),
+            ({"_id": "abc", "db": "Tasks"}, None),
+            ({"db": "Tasks"}, None),
+            ({"_id": 1}, None),
+        ],
+    )
+    def test_exact_id(self, selector, expected):
+        """Only a bare _id equality is treated as a primary-key lookup."""
+        assert _exact_id(selector) == expected
+
+    def test_find_body_projection(self, client):
+        """Fields are deduplicated, keep their order and always include _id."""
+        body = client._find_body({"db": "Tasks"}, ["title", "db", "title"], 10)
+        assert body == {
+            "selector": {"db": "Tasks"},
+            "limit": 10,
+            "fields": ["title", "db", "_id"],
+        }
+
+    def test_find_body_without_fields_or_hint(self, client):
+        """No projection or index hint is sent unless asked for."""
+        body = client._find_body({"db": "Tasks"}, None, 10)
+        assert "fields" not in body
+        assert "use_index" not in body
+
+    def test_find_body_index_hint(self, client):
+        """An explicit index is passed through as CouchDB's use_index list."""
+        body = client._find_body({"db": "Tasks"}, ["_id"], 10, DB_PARENT_INDEX)
+        assert body["use_index"] == list(DB_PARENT_INDEX)
+
+    def test_children_bulk_hints_parent_index(self, client, monkeypatch):
+        """get_children_bulk queries CouchDB on the db-parentId index."""
+        bodies = []
+
+        def post_find(body):
+            bodies.append(body)
+            return {"docs": [{"_id": "t1", "parentId": "p1"}]}
+
+        monkeypatch.setattr(client, "_post_find", post_find)
+        children = client.get_children_bulk(["p1", "p2"])
+
+        assert children == {"p1": [{"_id": "t1", "parentId": "p1"}], "p2": []}
+        assert bodies[0]["use_index"] == list(DB_PARENT_INDEX)
+
+    def test_find_docs_exact_id_skips_mango(self, client, monkeypatch):
+        """An {"_id": ...} selector is a direct GET, projected client-side."""
+        monkeypatch.setattr(
+            client, "_get_doc", lambda doc_id: {"_id": doc_id, "title": "T", "x": 1}
+        )
+        monkeypatch.setattr(client, "_post_find", pytest.fail)
+        assert client.find_docs({"_id": "t1"}, fields=["title"]) == [
+            {"title": "T", "_id": "t1"}
+        ]
+
+
+class TestIterDocs:
+    """Bookmark pagination in MarvinAPIClient.iter_docs."""
+
+    def test_follows_bookmarks_until_short_page(self, client, monkeypatch):
+        """Pages are chained by bookmark and stop on a short page."""
+        pages = [
+            {"docs": [{"_id": "1"}, {"_id": "2"}], "bookmark": "b1"},
+            {"docs": [{"_id": "3"}, {"_id": "4"}], "bookmark": "b2"},
+            {"docs": [{"_id": "5"}], "bookmark": "b3"},
+        ]
+        bookmarks = []
+
+        def post_find(body):
+            bookmarks.append(body.get("bookmark"))
+            return pages[len(bookmarks) - 1]
+
+        monkeypatch.setattr(client, "_post_find", post_find)
+        docs = client.iter_docs({"db": "Tasks"}, page_size=2)
+
+        assert [doc["_id"] for doc in docs] == ["1", "2", "3", "4", "5"]
+        assert bookmarks == [None, "b1", "b2"]
+
+    def test_stops_without_bookmark(self, client, monkeypatch):
+        """A full page without a bookmark ends the iteration."""
+        calls = []
+
+        def post_find(body):
+            calls.append(body)
+            return {"docs": [{"_id": "1"}, {"_id": "2"}]}
+
+        monkeypatch.setattr(client, "_post_find", post_find)
+        assert len(list(client.iter_docs({"db": "Tasks"}, page_size=2))) == 2
+        assert len(calls) == 1
+
+    def test_is_lazy(self, client, monkeypatch):
+        """No request is sent until the iterator is consumed."""
+        monkeypatch.setattr(client, "_post_find", pytest.fail)
+        client.iter_docs({"db": "Tasks"})
+
+
+class TestChildrenBulk:
+    """get_children_bulk over CouchDB and over the REST API."""
+
+    def test_couchdb_single_find_grouped_by_parent(self, client, monkeypatch):
+        """One $in query fetches every parent's children, tasks and projects."""
+        bodies = []
+        docs = [
+            {"_id": "t1", "db": "Tasks", "parentId": "p1"},
+            {"_id": "c1", "db": "Categories", "parentId": "p2"},
+            {"_id": "t2", "db": "Tasks", "parentId": "p1"},
+        ]
+
+        def post_find(body):
+            bodies.append(body)
+            return {"docs": docs}
+
+        monkeypatch.setattr(client, "_post_find", post_find)
+        children = client.get_children_bulk(["p1", "p2", "p3"])
+
+        assert len(bodies) == 1
+        assert bodies[0]["selector"] == {
+            "db": {"$in": ["Tasks", "Categories"]},
+            "parentId": {"$in": ["p1", "p2", "p3"]},
+        }
+        assert [c["_id"] for c in children["p1"]] == ["t1", "t2"]
+        assert [c["_id"] for c in children["p2"]] == ["c1"]
+        assert children["p3"] == []
+
+    def test_rest_failure_only_empties_that_parent(self, monkeypatch):
+        """Over REST a failing /children request empties only its parent."""
+        statuses = {"p1": 200, "p2": 500, "p3": 404}
+
+        def send(_method, url, **_kwargs):
+            parent_id = url.rsplit("=", 1)[1]
+            return make_response(statuses[parent_id], [{"_id": f"{parent_id}-c"}])
+
+        with MarvinAPIClient(api_key="test-key") as rest_client:
+            monkeypatch.setattr(rest_client, "_api_send", send)
+            children = rest_client.get_children_bulk(["p1", "p2", "p3"])
+
+        assert children == {"p1": [{"_id": "p1-c"}], "p2": [], "p3": []}
+
+    def test_no_parents_sends_nothing(self, client, monkeypatch):
+        """An empty parent list is answered without a request."""
+        monkeypatch.setattr(client, "_post_find", pytest.fail)
+        assert client.get_children_bulk([]) == {}
+
+
+class TestRetry:
+    """The rate-limit aware urllib3 retry policy."""
+
+    def test_retries_rate_limited_post(self):
+        """A 429 is retried even for non-idempotent methods."""
+        retry = _Retry(total=3, status_forcelist=[RATE_LIMITED, 503])
+        assert retry.is_retry("POST", RATE_LIMITED)
+
+    def test_does_not_retry_5xx_post(self):
+        """Other statuses keep urllib3's idempotent-only behaviour."""
+        retry = _Retry(total=3, status_forcelist=[RATE_LIMITED, 503])
+        assert not retry.is_retry("POST", 503)
+        assert retry.is_retry("GET", 503)
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [("5", 5), ("600", RETRY_BACKOFF_MAX), (None, None)],
+    )
+    def test_retry_after_is_capped(self, header, expected):
+        """A long server Retry-After is clamped to RETRY_BACKOFF_MAX."""
+        headers = {} if header is None else {"Retry-After": header}
+        response = HTTPResponse(status=RATE_LIMITED, headers=headers)
+        assert _Retry(total=3).get_retry_after(response) == expected
+
+    def test_exhausted_retry_stops(self):
+        """Once the budget is spent a 429 is no longer retried."""
+        retry = _Retry(total=0, status_forcelist=[RATE_LIMITED])
+        assert not retry.is_retry("POST", RATE_LIMITED)
+
+
+class TestMarvinTool:
+    """The _marvin_tool decorator shared by the MCP tools."""
+
+    def test_signature_hides_injected_arguments(self):
+        """api_client and start_time stay out of the tool's schema."""
+        signature = inspect.signature(main.batch_mark_done)
+        assert list(signature.parameters) == ["task_ids", "debug"]
+        assert "api_client" not in main.batch_mark_done.__annotations__
+        assert not hasattr(main.batch_mark_done, "__wrapped__")
+
+    def test_error_becomes_error_response(self, client, monkeypatch):
+        """An exception in the body is returned as an error response."""
+        monkeypatch.setattr(main, "_API_CLIENT", client)
+
+        @main._marvin_tool("/test", "test {item_id}")
+        async def failing(
+            item_id: str,
+            debug: bool = False,  # noqa: ARG001
+            *,
+            api_client,  # noqa: ARG001
+            start_time,  # noqa: ARG001
+        ):
+            raise ValueError(f"bad {item_id}")
+
+        response = asyncio.run(failing("x1"))
+        assert isinstance(response, StandardResponse)
+        assert not response.success
+        assert "bad x1" in response.summary.text
+
+    @pytest.mark.parametrize(
+        ("tool", "result_key"),
+        [
+            (main.batch_mark_done, "completed_tasks"),
+            (main.batch_create_tasks, "created_tasks"),
+        ],
+    )
+    def test_empty_batch_skips_client(self, tool, result_key, monkeypatch):
+        """An empty batch is answered without building the API client."""
+        monkeypatch.setattr(main, "_API_CLIENT", None)
+        monkeypatch.setattr(main, "create_api_client", pytest.fail)
+
+        response = asyncio.run(tool([]))
+        assert response.success
+        assert response.summary.text == "No tasks provided"
+        assert response.data[result_key] == []
+        assert response.data["total_requested"] == 0
+        assert main._API_CLIENT is None
+
+    def test_bad_time_range_is_logged_once(self, client, monkeypatch, caplog):
+        """A reversed range is an error response with a single log record."""
+        monkeypatch.setattr(main, "_API_CLIENT", client)
+        with caplog.at_level(logging.ERROR):
+            response = asyncio.run(
+                main.get_productivity_summary_for_time_range(
+                    start_date="2025-06-10", end_date="2025-06-01"
+                )
+            )
+        assert not response.success
+        assert "before start_date" in response.summary.text
+        assert len(caplog.records) == 1
+
+
+class TestContainsPattern:
+    """The case-insensitive regex built for query_tasks' contains filter."""
+
+    def test_escapes_regex_metacharacters(self):
+        """User text is matched literally."""
+        assert main._contains_pattern("a.b(c)") == r"(?i)a\.b\(c\)"
+
+    def test_leading_caret_anchors(self):
+        """A leading ^ anchors the match to the start of the field."""
+        assert main._contains_pattern("^Call") == "(?i)^Call"
+
+    def test_selector_searches_title_and_note(self):
+        """The contains builder adds an $or over title and note."""
+        selector: dict = {}
+        main._SELECTOR_BUILDERS["contains"](selector, "x")
+        assert selector == {
+            "$or": [{"title": {"$regex": "(?i)x"}}, {"note": {"$regex": "(?i)x"}}]
+        }
+
+
+class TestSplitByType:
+    """split_by_type in the task processor."""
+
+    def test_splits_projects_from_tasks(self):
+        """Projects go right; tasks and other items go left, order kept."""
+        items = [
+            {"_id": "1", "type": "project"},
+            {"_id": "2"},
+            {"_id": "3", "type": "task"},
+            {"_id": "4", "type": "project"},
+        ]
+        tasks, projects = split_by_type(items)
+        assert [t["_id"] for t in tasks] == ["2", "3"]
+        assert [p["_id"] for p in projects] == ["1", "4"]
+
+    def test_empty(self):
+        """No items yields two empty lists."""
+        assert split_by_type([]) == ([], [])
+
+
+class TestGenerateDates:
+    """Date-range validation in DateUtils.generate_dates."""
+
+    def test_explicit_range_is_inclusive(self):
+        """start_date and end_date are both included, oldest first."""
+        dates, start, end = DateUtils.generate_dates(
+            start_date="2025-06-01", end_date="2025-06-03"
+        )
+        assert [DateUtils.format_date(d) for d in dates] == [
+            "2025-06-01",
+            "2025-06-02",
+            "2025-06-03",
+        ]
+        assert (start, end) == (datetime(2025, 6, 1), datetime(2025, 6, 3))
+
+    def test_days_default_to_a_week(self):
+        """Without a start date the last 7 days are covered, newest first."""
+        dates, _, _ = DateUtils.generate_dates()
+        assert len(dates) == 7
+        assert dates[0] - dates[1] == timedelta(days=1)
+
+    def test_end_before_start_is_rejected(self):
+        """A reversed range raises instead of yielding no dates."""
+        with pytest.raises(ValueError, match="before start_date"):
+            DateUtils.generate_dates(start_date="2025-06-10", end_date="2025-06-01")
+
+    def test_malformed_date_is_rejected(self):
+        """Dates must be YYYY-MM-DD."""
+        with pytest.raises(ValueError, match="does not match format"):
+            DateUtils.generate_dates(start_date="06/01/2025")
+
+
+class FakeBulkDocs:
+    """Stand-in for MarvinAPIClient.bulk_docs; reject(doc) -> reason or None."""
+
+    def __init__(self, reject=lambda _doc: None):
+        self.reject = reject
+        self.calls: list[list[dict]] = []
+
+    def __call__(self, docs):
+        self.calls.append(docs)
+        results = []
+        for doc in docs:
+            reason = self.reject(doc)
+            if reason:
+                results.append(
+                    {"id": doc["_id"], "error": "forbidden", "reason": reason}
+                )
+            else:
+                results.append({"ok": True, "id": doc["_id"], "rev": "1-a"})
+        return results
+
+
+@pytest.fixture
+def direct_client(monkeypatch):
+    """Client with direct CouchDB writes enabled and bulk_docs stubbed."""
+    with MarvinAPIClient(
+        api_key="test-key",
+        db_uri="https://couch.example",
+        db_name="marvin",
+        db_user="user",
+        db_password="password",
+        db_direct_writes=True,
+    ) as api_client:
+        monkeypatch.setattr(api_client, "bulk_docs", FakeBulkDocs())
+        yield api_client
+
+
+class TestCreateProjectWithTasks:
+    """create_project_with_tasks with direct CouchDB writes."""
+
+    def test_project_is_written_before_tasks(self, direct_client):
+        """The project goes in its own request, its tasks in a second one."""
+        result = create_project_with_tasks(direct_client, "P", ["a", "b"])
+
+        project_call, task_call = direct_client.bulk_docs.calls
+        project = result["created_project"]
+        assert project_call == [project]
+        assert project["db"] == "Categories"
+        assert project["parentId"] == "root"
+        assert [doc["title"] for doc in task_call] == ["a", "b"]
+        assert all(doc["parentId"] == project["_id"] for doc in task_call)
+        assert result["task_count"] == 2
+
+    def test_rejected_project_writes_no_tasks(self, direct_client, monkeypatch):
+        """A rejected project raises before any task is written."""
+        monkeypatch.setattr(
+            direct_client,
+            "bulk_docs",
+            FakeBulkDocs(lambda doc: "no" if doc["db"] == "Categories" else None),
+        )
+        with pytest.raises(ValueError, match="rejected project"):
+            create_project_with_tasks(direct_client, "P", ["a", "b"])
+        assert len(direct_client.bulk_docs.calls) == 1
+
+    def test_rejected_task_is_left_out(self, direct_client, monkeypatch):
+        """Tasks CouchDB rejects are dropped from the created list."""
+        monkeypatch.setattr(
+            direct_client,
+            "bulk_docs",
+            FakeBulkDocs(lambda doc: "no" if doc.get("title") == "b" else None),
+        )
+        result = create_project_with_tasks(direct_client, "P", ["a", "b"])
+        assert [doc["title"] for doc in result["created_tasks"]] == ["a"]
+
+    def test_no_tasks_is_one_write(self, direct_client):
+        """A project without tasks needs only the project write."""
+        create_project_with_tasks(direct_client, "P", [])
+        assert len(direct_client.bulk_docs.calls) == 1
+
+
+class TestResolveLabel:
+    """Label name to ID resolution."""
+
+    def test_first_case_insensitive_match_wins(self, client, monkeypatch):
+        """Titles differing only in case resolve to the first label."""
+        labels = [
+            {"_id": "l1", "title": "Work"},
+            {"_id": "l2", "title": "WORK"},
+            {"title": "Untitled-id"},
+        ]
+        monkeypatch.setattr(client, "get_labels", lambda: labels)
+        assert resolve_label(client, "work") == "l1"
+        assert resolve_label(client, "untitled-id") is None
+        assert resolve_label(client, "missing") is None
+
+    def test_new_label_list_rebuilds_index(self, client, monkeypatch):
+        """A refreshed /labels response is picked up."""
+        monkeypatch.setattr(client, "get_labels", lambda: [{"_id": "a", "title": "X"}])
+        assert resolve_label(client, "x") == "a"
+        monkeypatch.setattr(client, "get_labels", lambda: [{"_id": "b", "title": "X"}])
+        assert resolve_label(client, "x") == "b"
+
+
+class TestQueryTasks:
+    """query_tasks against a stubbed CouchDB _find."""
+
+    @pytest.fixture
+    def selectors(self, client, monkeypatch):
+        """Route query_tasks to the test client and record each _find selector."""
+        found: list[dict] = []
+
+        def find_docs(selector, **_kwargs):
+            found.append(selector)
+            return [{"_id": "t1", "title": "Task", "labelIds": ["l1"]}]
+
+        monkeypatch.setattr(main, "_API_CLIENT", client)
+        monkeypatch.setattr(client, "find_docs", find_docs)
+        return found
+
+    def test_label_call_counted_only_when_fetched(self, client, selectors):
+        """A label resolved from the fresh /labels cache costs no API call."""
+        client._api_send = StubSend(
+            make_response(200, [{"_id": "l1", "title": "Work"}])
+        )
+
+        first = asyncio.run(main.query_tasks(label="work", debug=True))
+        second = asyncio.run(main.query_tasks(label="Work", debug=True))
+
+        assert first.debug.api_calls_made == 2
+        assert second.debug.api_calls_made == 1
+        assert len(client._api_send.calls) == 1
+        assert selectors[1]["labelIds"] == {"$elemMatch": {"$eq": "l1"}}
+
+    def test_selector_excludes_projects_with_nor(self, selectors):
+        """Plain tasks lack a type field, so projects are excluded via $nor."""
+        asyncio.run(main.query_tasks())
+        # Compare the selector as it goes over the wire
+        assert orjson.loads(orjson.dumps(selectors[0])) == {
+            "db": "Tasks",
+            "$nor": [{"type": "project"}, {"type": "category"}],
+            "done": {"$ne": True},
+        }
+
+    def test_selector_merges_filters(self, selectors):
+        """Range bounds merge, and include_done drops the done filter."""
+        asyncio.run(
+            main.query_tasks(
+                include_done=True,
+                due_after="2025-06-01",
+                due_before="2025-06-30",
+                parent_id="p1",
+                is_starred=True,
+            )
+        )
+        selector = selectors[0]
+        assert "done" not in selector
+        assert selector["dueDate"] == {"$gte": "2025-06-01", "$lte": "2025-06-30"}
+        assert selector["parentId"] == "p1"
+        assert selector["isStarred"] == 1
+
+    def test_exact_date_replaces_range(self, selectors):
+        """An exact due date wins over a due range on the same field."""
+        asyncio.run(main.query_tasks(due_after="2025-06-01", due="2025-06-15"))
+        assert selectors[0]["dueDate"] == "2025-06-15"
+
+
+class TestNewDoc:
+    """Building raw CouchDB docs for direct writes."""
+
+    def test_fills_marvin_defaults(self):
+        """Missing fields get the values /addTask and /addProject would set."""
+        task = new_doc("Tasks", {"title": "T"})
+        assert task["db"] == "Tasks"
+        assert task["parentId"] == "unassigned"
+        assert task["day"] == "unassigned"
+        assert task["done"] is False
+        assert task["rank"] == 0
+        assert task["createdAt"] == task["updatedAt"]
+        assert new_doc("Categories", {"title": "P"})["parentId"] == "root"
+
+    def test_given_fields_override_defaults(self):
+        """Caller fields win over the defaults."""
+        task = new_doc("Tasks", {"title": "T", "parentId": "p1", "done": True})
+        assert task["parentId"] == "p1"
+        assert task["done"] is True
+
+    def test_id_and_db_cannot_be_overridden(self):
+        """Caller-supplied _id and db are replaced, never written as given."""
+        task = new_doc("Tasks", {"title": "T", "_id": "taken", "db": "Categories"})
+        assert task["_id"] != "taken"
+        assert task["db"] == "Tasks"
+
+    def test_ids_are_unique(self):
+        """Every doc gets a fresh _id."""
+        assert new_doc("Tasks", {})["_id"] != new_doc("Tasks", {})["_id"]
+
+
+class TestCreateTaskWithParent:
+    """create_task_with_parent on the REST and direct-write paths."""
+
+    def test_rest_path_patches_parent(self, client, monkeypatch):
+        """Without direct writes the task goes via /addTask plus update_doc."""
+        updates = []
+        monkeypatch.setattr(client, "create_task", lambda _data: {"_id": "t1"})
+        monkeypatch.setattr(
+            client, "update_doc", lambda _item_id, setters: updates.append(setters)
+        )
+        monkeypatch.setattr(client, "bulk_docs", pytest.fail)
+
+        task = client.create_task_with_parent({"title": "T", "parentId": "p1"})
+        assert task["parentId"] == "p1"
+        assert updates == [[{"key": "parentId", "val": "p1"}]]
+
+    def test_direct_write_is_one_request(self, direct_client, monkeypatch):
+        """With direct writes the full doc is written in one _bulk_docs call."""
+        monkeypatch.setattr(direct_client, "create_task", pytest.fail)
+        task = direct_client.create_task_with_parent({"title": "T", "parentId": "p1"})
+        assert direct_client.bulk_docs.calls == [[task]]
+        assert task["parentId"] == "p1"
+        assert task["day"] == "unassigned"
+        assert task["_rev"] == "1-a"
+
+
+class TestBatchCreateTasks:
+    """Per-task outcomes in batch_create_tasks."""
+
+    def test_rest_failures_are_reported_per_task(self, client, monkeypatch):
+        """A failing /addTask fails only its own task, in input order."""
+
+        def create_task(data):
+            if data["title"] == "bad":
+                raise requests.HTTPError("500 Server Error")
+            return {"_id": f"id-{data['title']}", **data}
+
+        monkeypatch.setattr(client, "create_task", create_task)
+        result = batch_create_tasks(client, ["a", "bad", {"title": "c"}])
+
+        assert [t["title"] for t in result["created_tasks"]] == ["a", "c"]
+        assert result["failed_tasks"] == [{"task": "bad", "error": "500 Server Error"}]
+        assert (result["success_count"], result["failure_count"]) == (2, 1)
+        assert result["total_requested"] == 3
+
+    def test_bulk_rejections_are_reported_per_task(self, direct_client, monkeypatch):
+        """With direct writes, docs CouchDB rejects map back to their input."""
+        monkeypatch.setattr(
+            direct_client,
+            "bulk_docs",
+            FakeBulkDocs(lambda doc: "conflict" if doc["title"] == "bad" else None),
+        )
+        result = batch_create_tasks(direct_client, ["a", "bad"], project_id="p1")
+
+        (created,) = result["created_tasks"]
+        assert created["title"] == "a"
+        assert created["parentId"] == "p1"
+        (failed,) = result["failed_tasks"]
+        assert failed["task"] == "bad"
+        assert "conflict" in failed["error"]
+        assert len(direct_client.bulk_docs.calls) == 1
+
+    def test_bulk_request_failure_fails_every_task(self, direct_client, monkeypatch):
+        """If the _bulk_docs request itself fails, every task is reported."""
+
+        def bulk_docs(_docs):
+            raise requests.ConnectionError("down")
+
+        monkeypatch.setattr(direct_client, "bulk_docs", bulk_docs)
+        result = batch_create_tasks(direct_client, ["a", "b"])
+        assert result["failure_count"] == 2
+        assert [f["task"] for f in result["failed_tasks"]] == ["a", "b"]